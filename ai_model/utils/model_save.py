@@ -5,7 +5,7 @@ import json
 from datetime import datetime
 from typing import Optional, Tuple, Dict, Any
 from backend.config.logger import logger
-from backend.config.config import MODEL_NAME, BASE_DIR
+from backend.config.config import MODEL_NAME, BASE_DIR, MODEL_REPO_PATH, MODEL_REPO_URL, MODEL_BLOB_CACHE
 
 class GitLFSError(Exception):
     """Custom exception for Git LFS related errors"""
@@ -125,51 +125,35 @@ def safe_git_operation(command: list, cwd: str, operation_name: str) -> bool:
             repo_path=cwd
         )
 
+def model_repo(local_path: str, repo_url: str = MODEL_REPO_URL):
+    """Partial clone of the model repository at `local_path`, shared with the serving sync.
+
+    The models directory is not a regular checkout: it holds a blob-less
+    partial clone with an unborn HEAD and only the served versions checked
+    out, so every git operation goes through ModelRepoSync.
+    """
+    # Imported here as it needs the backend on the path, as when training runs from the admin app
+    from backend.config.model_sync import ModelRepoSync
+
+    # The served models directory keeps its git directory in the configured blob cache
+    git_dir = MODEL_BLOB_CACHE if os.path.abspath(local_path) == os.path.abspath(MODEL_REPO_PATH) else None
+    return ModelRepoSync(repo_path=local_path, repo_url=repo_url, interval=0, git_dir=git_dir)
+
 def safe_pull_before_push(local_path: str) -> bool:
-    """Safely pull latest changes before pushing."""
+    """Safely fetch the latest remote state before pushing."""
     try:
-        # Stash any local changes
-        stash_result = subprocess.run(
-            ["git", "stash"],
-            cwd=local_path,
-            capture_output=True,
-            text=True
-        )
-        
-        # Pull with rebase
-        pull_result = subprocess.run(
-            ["git", "pull", "--rebase", "origin", "main"],
-            cwd=local_path,
-            capture_output=True,
-            text=True
-        )
-        
-        if pull_result.returncode != 0:
-            raise GitOperationError(
-                operation="pull",
-                stderr=pull_result.stderr,
-                repo_path=local_path
-            )
-        
-        # Pop stash if we stashed changes
-        if "No local changes to save" not in stash_result.stderr:
-            subprocess.run(
-                ["git", "stash", "pop"],
-                cwd=local_path,
-                check=True
-            )
-            
+        # Publishing commits on top of the fetched branch, so there is nothing to stash or rebase
+        model_repo(local_path).refresh()
         return True
-        
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         raise GitOperationError(
             operation="safe_pull",
             stderr=str(e),
             repo_path=local_path
         )
 
-def setup_git_config(local_path: str) -> bool:
-    """Set up Git configuration."""
+def setup_git_config(local_path: str, git_dir: Optional[str] = None) -> bool:
+    """Set up Git configuration, in `git_dir` when the git directory is not under `local_path`."""
     configs = [
         ["user.email", "ai-training@example.com"],
         ["user.name", "AI Training Bot"],
@@ -179,8 +163,9 @@ def setup_git_config(local_path: str) -> bool:
     
     for config_name, config_value in configs:
         try:
+            git = ["git", f"--git-dir={git_dir}"] if git_dir else ["git"]
             safe_git_operation(
-                ["git", "config", config_name, config_value],
+                [*git, "config", config_name, config_value],
                 local_path,
                 f"git_config_{config_name}"
             )
@@ -218,7 +203,9 @@ def lock_version(version: str, local_path: str) -> None:
 
 def setup_git_repo(repo_url: str, local_path: str) -> bool:
     try:
-        subprocess.run(["git", "lfs", "install"], cwd=local_path, check=True)
+        # Install the LFS hooks into the model repository wherever its git directory lives
+        env = {**os.environ, "GIT_DIR": model_repo(local_path, repo_url).git_dir}
+        subprocess.run(["git", "lfs", "install", "--local"], cwd=local_path, env=env, check=True)
         # Remove the commit attempt since attributes already exist
         return True
     except Exception as e:
@@ -226,34 +213,34 @@ def setup_git_repo(repo_url: str, local_path: str) -> bool:
         return False
    
 def pull_repo(local_path: str, repo_url: str) -> bool:
-    try:
-        git_dir = os.path.join(local_path, '.git')
-        
-        if not os.path.exists(git_dir):
-            logger.info(f"Cloning repo to {local_path}")
-            subprocess.run(["git", "clone", repo_url, local_path], check=True)
-            setup_git_config(local_path)
-            return True
+    """Fetch the model repository into the partial clone without checking anything out.
 
-        logger.info("Updating existing repo")
-        subprocess.run(["git", "fetch", "origin"], cwd=local_path, check=True)
-        subprocess.run(["git", "reset", "--hard", "origin/main"], cwd=local_path, check=True)
-        subprocess.run(["git", "clean", "-fd"], cwd=local_path, check=True)
-        subprocess.run(["git", "pull"], cwd=local_path, check=True)
-        
+    Versions already checked out for serving and their local artifacts are
+    never reset or cleaned, and no other version is downloaded.
+    """
+    try:
+        repo = model_repo(local_path, repo_url)
+        logger.info(f"Fetching model repository into {repo.git_dir}")
+        repo.refresh()
+        setup_git_config(local_path, repo.git_dir)
         return True
     except Exception as e:
         logger.error(f"Pull failed: {e}")
         return False
 
-def get_next_version(models_dir: str) -> str:
-    """Get the next version number with improved pattern matching."""
+def get_next_version(models_dir: str, known_versions: Tuple[str, ...] = ()) -> str:
+    """Get the next version number with improved pattern matching.
+
+    `known_versions` are versions on the remote that are not checked out locally.
+    """
     try:
         if not os.path.exists(models_dir):
             return "v1.0.0"
             
         version_pattern = re.compile(r"trained_model_v(\d+)\.0\.0")
-        existing_versions = []
+        existing_versions = [
+            int(match.group(1)) for match in map(version_pattern.match, known_versions) if match
+        ]
         
         for item in os.listdir(models_dir):
             match = version_pattern.match(item)
@@ -327,11 +314,11 @@ def save_metrics(metrics: Dict, version: str, metrics_dir: str) -> Optional[str]
 
 def push_model_and_metrics(repo_path: str, version: str, model_dir: str, metrics_file: Optional[str]) -> bool:
     try:
-        # Add the newly trained model files
-        subprocess.run(["git", "add", f"trained_model_{version}/*"], cwd=repo_path, check=True)
-        subprocess.run(["git", "add", f"metrics/metrics_{version}.json"], cwd=repo_path, check=True)
-        subprocess.run(["git", "commit", "-m", f"Add model version {version}"], cwd=repo_path, check=True)
-        subprocess.run(["git", "push"], cwd=repo_path, check=True)
+        # Commit the newly trained model files on top of the remote branch and push them
+        paths = [model_dir]
+        if metrics_file:
+            paths.append(os.path.relpath(metrics_file, repo_path))
+        model_repo(repo_path).publish(paths, f"Add model version {version}")
         return True
     except Exception as e:
         logger.error(f"Push failed: {e}")
@@ -355,7 +342,9 @@ def save_and_version_model(
            if not git_setup_success:
                logger.warning("Git setup failed, continuing without versioning")
 
-       version = get_next_version(models_dir)
+       # Versions on the remote count too, although only the served ones are checked out
+       known_versions = tuple(model_repo(models_dir, repo_url).known_versions()) if repo_url else ()
+       version = get_next_version(models_dir, known_versions)
        lock_version(version, models_dir)
        lock_file = os.path.join(models_dir, f"{version}.lock")
        
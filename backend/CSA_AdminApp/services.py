@@ -1,11 +1,12 @@
 # Import necessary modules and classes
-from ai_model.train import train_and_evaluate_model
 from backend.config.logger import logger
 
 # Define a service class for managing AI model-related operations
 class AIModelService:
     @staticmethod
     def train_model():
+        # The training stack (torch, transformers, sklearn) is only imported when training runs
+        from ai_model.train import train_and_evaluate_model
         try:
             result = train_and_evaluate_model()
             if result['success']:
@@ -7,8 +7,8 @@ from django.contrib.auth.hashers import check_password
 from django.views.decorators.csrf import csrf_exempt
 from .models import Admin
 from app.models import TextAnalysis
+from app.pagination import keyset_page
 from django.http import HttpResponse
-from django.db.models import Q
 import uuid
 import csv
 import os
@@ -19,8 +19,10 @@ from .services import AIModelService
 from django.http import JsonResponse
 from django.core.cache import cache
 from config.model_manager import ModelManager
-from config.config import MODEL_REPO_URL
-from ai_model.utils.model_save import pull_repo
+from config.config import DASHBOARD_PAGE_SIZE
+from config.model_holder import model_holder
+from config.model_sync import model_sync, ModelSyncError
+from backend.config.logger import logger
 from pathlib import Path
 
 
@@ -28,8 +30,6 @@ from pathlib import Path
 # Global variable to track training status
 BASE_DIR = Path(__file__).resolve().parent.parent
 training_in_progress =  False
-models_dir = BASE_DIR / "models"
-pull_repo(models_dir ,MODEL_REPO_URL)
 
 # Train the AI Model
 class TrainModelView(APIView):
@@ -68,7 +68,15 @@ def change_model_version(request):
     if request.method == 'POST':
         version = request.POST.get('version')
         if version in ModelManager.get_available_versions():
+            try:
+                # Versions that are not checked out yet are fetched on demand
+                model_sync.materialize(version)
+            except ModelSyncError as e:
+                logger.error(f"Failed to fetch model version {version}: {e}")
+                return JsonResponse({'success': False, 'error': str(e)})
             ModelManager.set_current_version(version)
+            # Load and warm up the new version in the background; requests switch once it is ready
+            model_holder.activate(ModelManager.get_model_path(version))
             return JsonResponse({'success': True})
     return JsonResponse({'success': False})
 
@@ -119,9 +127,9 @@ def dashboard(request):
     }
 
     # Start with all data or filter by search query
-    data = TextAnalysis.objects.using('default').all()
+    data = TextAnalysis.objects.using('default').order_by('-created_at', '-id')
     if search_query:
-        data = data.filter(Q(text__icontains=search_query))
+        data = data.search(search_query)
 
     # Apply filters dynamically
     for label, value in filters.items():
@@ -130,9 +138,17 @@ def dashboard(request):
         elif value == 'no':
             data = data.filter(**{label: False})
 
-    # Pass the filter states and search query to the template
+    # One keyset page instead of every row, with an estimated total
+    page = keyset_page(data, request.GET.get('after'), request.GET.get('before'), per_page=DASHBOARD_PAGE_SIZE)
+    # Current filters and search, for the page links to carry over
+    filter_query = request.GET.copy()
+    filter_query.pop('after', None)
+    filter_query.pop('before', None)
+
+    # Pass the page, the filter states and search query to the template
     context = {
-        'data': data,
+        'data': page,
+        'filter_query': filter_query.urlencode(),
         'search_query': search_query,
         'toxic_filter': filters['toxic'],
         'severe_toxic_filter': filters['severe_toxic'],
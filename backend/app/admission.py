@@ -0,0 +1,103 @@
+# Import necessary modules and classes
+import math
+import threading
+import time
+from contextlib import contextmanager
+from config.config import ADMISSION_QUEUE_SIZE, ADMISSION_DEADLINE_MS
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be served before its deadline"""
+    def __init__(self, reason, retry_after):
+        self.reason = reason
+        self.retry_after = retry_after  # Seconds after which a retry is likely to be admitted
+        super().__init__(f"Request rejected ({reason}), retry after {retry_after}s")
+
+
+class AdmissionController:
+    """Bounded admission in front of inference with deadline-aware load shedding.
+
+    Every admitted request counts towards the queue depth until it finishes.
+    The controller keeps an exponentially weighted moving average of how long
+    each finished request occupied the system after the previous one
+    finished, which under load is the time between completions. The estimated
+    wait for a new request is the current depth times that interval; requests
+    that would miss their deadline, or find the queue full, are rejected
+    immediately instead of timing out later.
+    """
+
+    EWMA_ALPHA = 0.2  # Weight of the newest service time sample
+
+    def __init__(self, max_queue_size=ADMISSION_QUEUE_SIZE, default_deadline_ms=ADMISSION_DEADLINE_MS):
+        self.max_queue_size = max_queue_size
+        self.default_deadline = default_deadline_ms / 1000.0
+        self._lock = threading.Lock()
+        self._service_time = None
+        self._last_completion = 0.0
+        self.depth = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_deadline = 0
+
+    def deadline(self, deadline_ms=None):
+        """Absolute monotonic deadline for a request arriving now."""
+        budget = deadline_ms / 1000.0 if deadline_ms else self.default_deadline
+        return time.monotonic() + budget
+
+    def estimated_wait(self):
+        """Seconds a request admitted now is expected to take. Caller holds the lock."""
+        if self._service_time is None:
+            return 0.0
+        return (self.depth + 1) * self._service_time
+
+    @contextmanager
+    def admit(self, deadline=None):
+        """Count the block as one request in the system, or raise AdmissionRejected."""
+        deadline = deadline or self.deadline()
+        with self._lock:
+            now = time.monotonic()
+            wait = self.estimated_wait()
+            if self.depth >= self.max_queue_size:
+                self.rejected_queue_full += 1
+                raise AdmissionRejected("queue full", self._retry_after(wait))
+            # An idle system always admits, so a stale estimate cannot lock everyone out
+            if self.depth and now + wait > deadline:
+                self.rejected_deadline += 1
+                raise AdmissionRejected("deadline", self._retry_after(wait))
+            self.depth += 1
+            self.admitted += 1
+            admitted_at = now
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                now = time.monotonic()
+                sample = now - max(admitted_at, self._last_completion)
+                self._last_completion = now
+                self._service_time = sample if self._service_time is None else (
+                    self.EWMA_ALPHA * sample + (1 - self.EWMA_ALPHA) * self._service_time
+                )
+                self.depth -= 1
+
+    @staticmethod
+    def _retry_after(wait):
+        """Whole seconds until the current backlog is expected to drain."""
+        return max(1, math.ceil(wait))
+
+    def stats(self):
+        """Return the queue depth, rejection counters and current wait estimate."""
+        with self._lock:
+            return {
+                "depth": self.depth,
+                "max_queue_size": self.max_queue_size,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_deadline": self.rejected_deadline,
+                "service_time_ms": self._service_time * 1000 if self._service_time is not None else None,
+                "estimated_wait_ms": self.estimated_wait() * 1000,
+            }
+
+
+# Shared admission controller used by the analysis views
+admission = AdmissionController()
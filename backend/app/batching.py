@@ -0,0 +1,200 @@
+# Import necessary modules and classes
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from config.config import (
+    BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_QUEUE_SIZE, ASYNC_INFERENCE_WORKERS, ASYNC_MAX_PENDING
+)
+from backend.config.logger import logger
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference queue cannot accept more work"""
+
+
+class _BatchItem:
+    """Texts submitted by one request, together with the model that should score them."""
+    __slots__ = ("model", "tokenizer", "texts", "window", "future")
+
+    def __init__(self, model, tokenizer, texts, window):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.texts = texts
+        self.window = window
+        self.future = Future()
+
+
+class InferenceBatcher:
+    """Collects scoring requests from concurrent callers and runs them as shared padded batches.
+
+    A single worker thread waits for the first request, then keeps collecting
+    for up to `max_wait_ms` or until `max_batch_size` texts are pending, and
+    scores everything it collected in as few forward passes as possible.
+    """
+
+    def __init__(self, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS, max_queue_size=BATCH_QUEUE_SIZE):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, model, tokenizer, texts, window=None):
+        """Queue `texts` for scoring and return a Future resolving to their probabilities.
+
+        `window` holds the long-text settings passed on to `predict_probabilities`.
+        """
+        self._ensure_worker()
+        item = _BatchItem(model, tokenizer, list(texts), dict(window or {}))
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            raise InferenceQueueFull(f"Inference queue is full ({self._queue.maxsize} pending requests)")
+        return item.future
+
+    def predict(self, model, tokenizer, texts, window=None):
+        """Score `texts` through the shared batch and wait for the result."""
+        return self.submit(model, tokenizer, texts, window).result()
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        """Block for the first request, then gather more until the window closes or the batch is full."""
+        batch = [self._queue.get()]
+        pending = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while pending < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            pending += len(item.texts)
+
+        return batch
+
+    def _run(self):
+        """Worker loop: score collected requests grouped by model and long-text settings.
+
+        A failure only fails the requests it concerns; the loop keeps serving
+        the next batch, so no caller is left waiting on a dead worker.
+        """
+        while True:
+            batch = self._collect()
+            try:
+                groups = {}
+                for item in batch:
+                    key = (id(item.model), tuple(sorted(item.window.items())))
+                    groups.setdefault(key, []).append(item)
+            except Exception as e:
+                logger.error(f"Grouping batched requests failed: {e}")
+                self._fail(batch, e)
+                continue
+
+            for items in groups.values():
+                try:
+                    self._run_group(items)
+                except Exception as e:
+                    logger.error(f"Batched inference failed: {e}")
+                    self._fail(items, e)
+
+    def _run_group(self, items):
+        """Score all texts of requests sharing one model and hand each request its own rows."""
+        # Imported here so importing the batcher does not load torch
+        import torch
+        from .inference import predict_probabilities
+
+        model, tokenizer, window = items[0].model, items[0].tokenizer, items[0].window
+        texts = [text for item in items for text in item.texts]
+
+        # Sort by length so each padded chunk wastes as little attention as possible
+        order = sorted(range(len(texts)), key=lambda index: len(texts[index]))
+        rows = [None] * len(texts)
+        for start in range(0, len(order), self.max_batch_size):
+            chunk = order[start:start + self.max_batch_size]
+            probabilities = predict_probabilities(model, tokenizer, [texts[index] for index in chunk], **window)
+            for index, row in zip(chunk, probabilities):
+                rows[index] = row
+
+        # Each request is resolved on its own, so one bad request cannot fail the others
+        offset = 0
+        for item in items:
+            item_rows = rows[offset:offset + len(item.texts)]
+            offset += len(item.texts)
+            try:
+                result = torch.stack(item_rows)
+            except Exception as e:
+                logger.error(f"Could not assemble the rows of a batched request: {e}")
+                self._fail([item], e)
+                continue
+            self._resolve(item.future, result=result)
+
+    @classmethod
+    def _fail(cls, items, error):
+        """Fail the futures of `items` that are still unresolved."""
+        for item in items:
+            cls._resolve(item.future, error=error)
+
+    @staticmethod
+    def _resolve(future, result=None, error=None):
+        """Set the outcome of `future`, ignoring futures cancelled or resolved in the meantime."""
+        if future.done():
+            return
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass  # Cancelled by its caller between the check and the hand-off
+
+
+class InferenceExecutor:
+    """Bounded thread pool that runs blocking inference on behalf of async views.
+
+    The event loop only awaits the result, so slow clients never hold a
+    thread. At most `max_pending` calls are accepted at once; further calls
+    raise InferenceQueueFull instead of queueing without limit.
+    """
+
+    def __init__(self, max_workers=ASYNC_INFERENCE_WORKERS, max_pending=ASYNC_MAX_PENDING):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and await its result."""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise InferenceQueueFull(f"Inference executor is full ({self.max_pending} pending calls)")
+            self.pending += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def stats(self):
+        """Return the number of pending and rejected calls."""
+        with self._lock:
+            return {"pending": self.pending, "max_pending": self.max_pending, "rejected": self.rejected}
+
+
+# Shared batcher and executor used by the analysis views
+batcher = InferenceBatcher()
+inference_executor = InferenceExecutor()
@@ -0,0 +1,232 @@
+# Import necessary modules and classes
+import torch
+
+# Output labels of the classifier, in the order of the model logits
+LABELS = ["toxic", "severe_toxic", "obscene", "threat", "insult", "identity_hate"]
+THRESHOLD = 0.5  # Probability above which a label is flagged
+MAX_LENGTH = 512  # Maximum number of tokens fed to BERT
+ATTRIBUTION_THRESHOLD = 0.5  # Share of the strongest word attribution needed to flag a word
+
+# Highlighting modes: score each word on its own, or attribute the full-text prediction to its words
+HIGHLIGHT_WORDS = "words"
+HIGHLIGHT_ATTRIBUTION = "attribution"
+
+# Long-text modes: keep only the first MAX_LENGTH tokens, or score the whole text in overlapping windows
+LONG_TEXT_TRUNCATE = "truncate"
+LONG_TEXT_WINDOW = "window"
+
+# How the windows of a long text are combined into one score per label
+AGGREGATE_MAX = "max"
+AGGREGATE_MEAN = "mean"
+
+
+def window_settings(long_text_mode, window_size, stride, aggregation=AGGREGATE_MAX):
+    """Keyword arguments for the scoring helpers under the given long-text mode."""
+    if long_text_mode != LONG_TEXT_WINDOW:
+        return {}
+    return {"max_length": window_size, "stride": stride, "aggregation": aggregation}
+
+
+def encode(tokenizer, texts, max_length=MAX_LENGTH, stride=None, **kwargs):
+    """Tokenize `texts` as one padded batch.
+
+    With `stride` set, texts longer than `max_length` tokens overflow into
+    extra windows that share `stride` tokens with the previous one. Returns
+    the model inputs and, for every row, the index of the text it came from.
+    """
+    # Every call passes the same truncation settings, so the shared Rust
+    # tokenizer is not reconfigured between concurrent calls
+    inputs = tokenizer(
+        texts,
+        return_tensors="pt",
+        truncation=True,
+        padding=True,
+        max_length=max_length,
+        stride=stride or 0,
+        return_overflowing_tokens=stride is not None,
+        **kwargs
+    )
+    rows = inputs.pop("overflow_to_sample_mapping", None)
+    if rows is None:
+        rows = torch.arange(inputs["input_ids"].shape[0])
+    return inputs, rows
+
+
+def aggregate_windows(probabilities, rows, count, aggregation=AGGREGATE_MAX):
+    """Combine per-window probabilities into one row per text by max or mean."""
+    if probabilities.shape[0] == count:
+        return probabilities  # One window per text, nothing to combine
+
+    reduce = "mean" if aggregation == AGGREGATE_MEAN else "amax"
+    index = rows.unsqueeze(-1).expand_as(probabilities)
+    return torch.zeros(count, probabilities.shape[-1]).scatter_reduce(
+        0, index, probabilities, reduce=reduce, include_self=False
+    )
+
+
+def predict_probabilities(model, tokenizer, texts, max_length=MAX_LENGTH, stride=None, aggregation=AGGREGATE_MAX):
+    """Score a list of texts in a single padded forward pass.
+
+    With `stride` set, long texts are split into overlapping windows of
+    `max_length` tokens that all run in the same batch, and their
+    probabilities are aggregated per text. Returns a
+    (len(texts), len(LABELS)) tensor of sigmoid probabilities.
+    """
+    inputs, rows = encode(tokenizer, texts, max_length, stride)
+
+    with torch.no_grad():
+        logits = model(**inputs).logits
+
+    return aggregate_windows(pad_labels(torch.sigmoid(logits)), rows, len(texts), aggregation)
+
+
+def pad_labels(probabilities):
+    """Pad or trim the label dimension so every row has one column per label."""
+    missing = len(LABELS) - probabilities.shape[-1]
+    if missing > 0:
+        probabilities = torch.nn.functional.pad(probabilities, (0, missing))
+    return probabilities[..., :len(LABELS)]
+
+
+def build_results(probabilities):
+    """Turn one row of label probabilities into the per-label response dict."""
+    results = {}
+    for label, probability in zip(LABELS, probabilities.tolist()):
+        results[label] = {
+            "toxic": probability > THRESHOLD,
+            "probability": float(probability)
+        }
+    return results
+
+
+def flag_words(predict, words):
+    """Flag toxic words by scoring every distinct word in one batched forward pass.
+
+    `predict` maps a list of texts to their label probabilities. Returns one
+    list of label flags per word, aligned with ``words``.
+    """
+    if not words:
+        return []
+
+    # Score each distinct word only once, then threshold all labels at once
+    unique_words = list(dict.fromkeys(words))
+    probabilities = predict(unique_words)
+    flags = dict(zip(unique_words, (probabilities > THRESHOLD).tolist()))
+
+    return [flags[word] for word in words]
+
+
+def attribute_words(model, tokenizer, words, max_length=MAX_LENGTH, stride=None, aggregation=AGGREGATE_MAX):
+    """Classify the text formed by `words` and attribute every flagged label back to its words.
+
+    Uses gradient x input over the word embeddings of the single full-text
+    forward pass, so no per-word passes are needed. `tokenizer` must be a
+    fast tokenizer, which provides the token to word alignment. `stride`
+    splits long texts into windows as in `predict_probabilities`. Returns the
+    label probabilities of the text and one list of label flags per word.
+    """
+    # The fast tokenizer maps each piece of every window back to its word
+    inputs, rows = encode(tokenizer, [words], max_length, stride, is_split_into_words=True)
+    input_ids = inputs["input_ids"]
+    piece_words = torch.tensor([
+        [-1 if index is None else index for index in inputs.word_ids(row)]
+        for row in range(input_ids.shape[0])
+    ])
+    embeddings = model.get_input_embeddings()(input_ids).detach().requires_grad_(True)
+
+    with torch.enable_grad():
+        window_logits = model(
+            inputs_embeds=embeddings,
+            attention_mask=inputs["attention_mask"],
+            token_type_ids=torch.zeros_like(input_ids)
+        ).logits
+        # Words covered by two windows collect attribution from both
+        logits = window_logits.sum(dim=0)
+
+        probabilities = aggregate_windows(
+            pad_labels(torch.sigmoid(window_logits.detach())), rows, 1, aggregation
+        )[0]
+        word_flags = [[False] * len(LABELS) for _ in words]
+        in_word = piece_words >= 0
+
+        # Only labels flagged on the full text need a backward pass
+        for label_index in (probabilities > THRESHOLD).nonzero().flatten().tolist():
+            gradients, = torch.autograd.grad(logits[label_index], embeddings, retain_graph=True)
+            piece_scores = (gradients * embeddings).sum(dim=-1).detach()
+            word_scores = torch.zeros(len(words)).index_add_(
+                0, piece_words[in_word], piece_scores[in_word]
+            )
+
+            strongest = word_scores.max() if len(words) else 0
+            if strongest <= 0:
+                continue
+            for index in (word_scores >= ATTRIBUTION_THRESHOLD * strongest).nonzero().flatten().tolist():
+                word_flags[index][label_index] = True
+
+    return probabilities, word_flags
+
+
+def analyze(model, tokenizer, text, highlight_mode=HIGHLIGHT_WORDS, predict=None, **window):
+    """Classify `text` and flag its toxic words using the selected highlighting mode.
+
+    `predict` runs the gradient-free forward passes (for example through the
+    shared batcher) and defaults to scoring directly with `model`. `window`
+    holds the `max_length`, `stride` and `aggregation` settings used for long
+    texts. Returns the per-label results, the flagged words and the
+    highlighted text.
+    """
+    words = text.split()
+    if predict is None:
+        predict = lambda texts: predict_probabilities(model, tokenizer, texts, **window)
+
+    if highlight_mode == HIGHLIGHT_ATTRIBUTION:
+        # One full-text pass gives both the classification and the word attributions
+        probabilities, word_flags = attribute_words(model, tokenizer, words, **window)
+    else:
+        # Flag individual words with one batched pass over all words
+        word_flags = flag_words(predict, words)
+        probabilities = predict([text])[0]
+
+    word_results, highlighted_text = highlight_words(words, word_flags)
+    return build_results(probabilities), word_results, highlighted_text
+
+
+def analyze_batch(predict, texts, highlight=True):
+    """Classify several texts and flag the words of all of them together.
+
+    The texts are scored in one `predict` call and every distinct word across
+    them in another, so highlighting costs one shared pass per batch rather
+    than one per text. Returns one (results, word_results, highlighted_text)
+    tuple per text; without `highlight` the word results are empty and the
+    highlighted text is None.
+    """
+    probabilities = predict(texts)
+    if not highlight:
+        return [(build_results(row), [], None) for row in probabilities]
+
+    words_per_text = [text.split() for text in texts]
+    word_flags = flag_words(predict, [word for words in words_per_text for word in words])
+
+    analyses = []
+    offset = 0
+    for row, words in zip(probabilities, words_per_text):
+        word_results, highlighted_text = highlight_words(words, word_flags[offset:offset + len(words)])
+        analyses.append((build_results(row), word_results, highlighted_text))
+        offset += len(words)
+    return analyses
+
+
+def highlight_words(words, word_flags):
+    """Build the flagged word list and highlighted text from per-word label flags."""
+    word_results = []
+    highlighted = []
+
+    for word, flags in zip(words, word_flags):
+        if any(flags):
+            word_results.append({"word": word, **dict(zip(LABELS, flags))})
+            # Highlight toxic words
+            highlighted.append(f'<span class="text-red-600 font-bold">{word}</span>')
+        else:
+            highlighted.append(word)
+
+    return word_results, " ".join(highlighted)
@@ -0,0 +1,121 @@
+# Import necessary modules and classes
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# SQLite's defaults: rollback journal, full fsync on every commit, deferred transactions
+DEFAULT_OPTIONS = {"timeout": 5, "transaction_mode": None, "init_command": ""}
+
+CREATE_TABLE = (
+    "CREATE TABLE analysis (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL, "
+    "created_at TEXT NOT NULL, toxic BOOLEAN NOT NULL, toxic_probability REAL NOT NULL)"
+)
+INSERT = "INSERT INTO analysis (text, created_at, toxic, toxic_probability) VALUES (?, datetime('now'), ?, ?)"
+# What the home page and the dashboard run for every page view
+READS = (
+    "SELECT id, text, created_at, toxic FROM analysis ORDER BY created_at DESC LIMIT 10",
+    "SELECT COUNT(*) FROM analysis",
+)
+
+
+def connect(path, options):
+    """Open a connection configured like Django does for `options`."""
+    conn = sqlite3.connect(path, timeout=options.get("timeout", 5), isolation_level=None, check_same_thread=False)
+    for command in options.get("init_command", "").split(";"):
+        if command.strip():
+            conn.execute(command)
+    return conn
+
+
+def run_workload(path, options, writers, readers, seconds):
+    """Run writer and reader threads against `path` and count their operations and lock errors."""
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+    begin = f"BEGIN {options['transaction_mode']}" if options.get("transaction_mode") else "BEGIN"
+
+    def write():
+        conn = connect(path, options)
+        done = errors = 0
+        while not stop.is_set():
+            try:
+                conn.execute(begin)
+                conn.execute(INSERT, ("benchmark text", done % 2, 0.5))
+                conn.execute("COMMIT")
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+        conn.close()
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    def read():
+        conn = connect(path, options)
+        done = errors = 0
+        while not stop.is_set():
+            try:
+                for query in READS:
+                    conn.execute(query).fetchall()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        conn.close()
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    threads += [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+class Command(BaseCommand):
+    help = "Compare SQLite reader/writer throughput with SQLite's defaults and with the configured database options."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias whose options are benchmarked")
+        parser.add_argument("--writers", type=int, default=2, help="Threads inserting one analysis per transaction")
+        parser.add_argument("--readers", type=int, default=4, help="Threads running the list page queries")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+        parser.add_argument("--rows", type=int, default=10000, help="Rows in the table before each run")
+
+    def handle(self, *args, **options):
+        if options["database"] not in settings.DATABASES:
+            raise CommandError(f"Unknown database alias: {options['database']}")
+        configured = {**DEFAULT_OPTIONS, **settings.DATABASES[options["database"]].get("OPTIONS", {})}
+
+        self.stdout.write(f"{options['writers']} writers, {options['readers']} readers, "
+                          f"{options['seconds']:g}s per run, {options['rows']} rows")
+        # The benchmark uses a scratch file, never the real database
+        for label, run_options in (("sqlite defaults", DEFAULT_OPTIONS), (f"{options['database']} settings", configured)):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "benchmark.sqlite3")
+                conn = connect(path, run_options)
+                conn.execute(CREATE_TABLE)
+                conn.execute("BEGIN")
+                conn.executemany(INSERT, (("seed text", i % 2, 0.5) for i in range(options["rows"])))
+                conn.execute("COMMIT")
+                journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                conn.close()
+
+                counts = run_workload(path, run_options, options["writers"], options["readers"], options["seconds"])
+
+            self.stdout.write(
+                f"{label} (journal_mode={journal_mode}): "
+                f"{counts['writes'] / options['seconds']:.0f} writes/s, "
+                f"{counts['reads'] / options['seconds']:.0f} reads/s, "
+                f"{counts['errors']} lock errors"
+            )
@@ -0,0 +1,79 @@
+# Import necessary modules and classes
+import time
+import pandas as pd
+import torch
+from django.core.management.base import BaseCommand, CommandError
+from app.inference import (
+    LABELS, THRESHOLD, MAX_LENGTH, LONG_TEXT_TRUNCATE, LONG_TEXT_WINDOW, AGGREGATE_MAX, AGGREGATE_MEAN,
+    predict_probabilities, window_settings
+)
+from config.config import BATCH_SIZE, MAX_LEN, TEST_DATA_PATH, LONG_TEXT_MODE, WINDOW_STRIDE, WINDOW_AGGREGATION
+from config.model_holder import load_pretrained, BACKEND_TORCH, BACKEND_QUANTIZED
+from config.model_manager import ModelManager
+
+
+def score(model, tokenizer, texts, batch_size, window):
+    """Score `texts` in batches with the long-text `window` settings and return the probabilities and the time spent."""
+    started = time.perf_counter()
+    rows = [
+        predict_probabilities(model, tokenizer, texts[start:start + batch_size], **window)
+        for start in range(0, len(texts), batch_size)
+    ]
+    return torch.cat(rows), time.perf_counter() - started
+
+
+def describe_window(window):
+    """How texts are tokenized under the given long-text settings."""
+    if not window:
+        return f"first {MAX_LENGTH} tokens of each text"
+    return (f"{window['max_length']}-token windows, stride {window['stride']}, "
+            f"{window['aggregation']} aggregation")
+
+
+class Command(BaseCommand):
+    help = "Compare the dynamic int8 quantized model with the float model on the held-out test split."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model-version", default=None, help="Model version to check (defaults to the current one)")
+        parser.add_argument("--data", default=TEST_DATA_PATH, help="CSV with comment_text and label columns")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--min-agreement", type=float, default=0.0,
+                            help="Fail when fewer label decisions than this fraction match the float model")
+        # Scored as served by default, so the numbers describe the model as it answers requests
+        parser.add_argument("--long-text-mode", choices=[LONG_TEXT_TRUNCATE, LONG_TEXT_WINDOW], default=LONG_TEXT_MODE)
+        parser.add_argument("--window-size", type=int, default=MAX_LEN, help="Tokens per window in window mode")
+        parser.add_argument("--stride", type=int, default=WINDOW_STRIDE, help="Tokens shared by consecutive windows")
+        parser.add_argument("--aggregation", choices=[AGGREGATE_MAX, AGGREGATE_MEAN], default=WINDOW_AGGREGATION)
+
+    def handle(self, *args, **options):
+        model_path = ModelManager.get_model_path(options["model_version"])
+        data = pd.read_csv(options["data"])
+        texts = data["comment_text"].astype(str).tolist()
+        labels = torch.tensor(data[LABELS].values, dtype=torch.bool)
+
+        float_loaded = load_pretrained(model_path, BACKEND_TORCH)
+        quantized_loaded = load_pretrained(model_path, BACKEND_QUANTIZED)
+
+        window = window_settings(options["long_text_mode"], options["window_size"], options["stride"], options["aggregation"])
+        float_probs, float_time = score(float_loaded.model, float_loaded.tokenizer, texts, options["batch_size"], window)
+        quantized_probs, quantized_time = score(
+            quantized_loaded.model, quantized_loaded.tokenizer, texts, options["batch_size"], window
+        )
+
+        float_flags = float_probs > THRESHOLD
+        quantized_flags = quantized_probs > THRESHOLD
+        agreement = (float_flags == quantized_flags).float().mean().item()
+
+        self.stdout.write(f"Model: {float_loaded.version} ({len(texts)} test texts)")
+        self.stdout.write(f"Scoring: {options['long_text_mode']} mode, {describe_window(window)}")
+        self.stdout.write(f"Float accuracy:     {(float_flags == labels).float().mean().item():.4f}")
+        self.stdout.write(f"Quantized accuracy: {(quantized_flags == labels).float().mean().item():.4f}")
+        self.stdout.write(f"Decision agreement: {agreement:.4f}")
+        self.stdout.write(f"Max probability difference: {(float_probs - quantized_probs).abs().max().item():.4f}")
+        self.stdout.write(f"Float time: {float_time:.2f}s, quantized time: {quantized_time:.2f}s "
+                          f"(speedup {float_time / max(quantized_time, 1e-9):.2f}x)")
+        self.stdout.write(f"Model size: {float_loaded.nbytes / 2**20:.1f} MiB float, "
+                          f"{quantized_loaded.nbytes / 2**20:.1f} MiB quantized")
+
+        if agreement < options["min_agreement"]:
+            raise CommandError(f"Quantized decisions agree on only {agreement:.4f} of labels")
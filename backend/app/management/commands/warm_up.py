@@ -0,0 +1,30 @@
+# Import necessary modules and classes
+import time
+from django.core.management.base import BaseCommand, CommandError
+from config.model_holder import model_holder
+from config.model_sync import model_sync
+from config.warmup import warm_up_serving
+
+
+class Command(BaseCommand):
+    help = "Sync the model repository, load the active model and run a warm-up inference."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skip-sync", action="store_true", help="Do not fetch the model repository first")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if not options["skip_sync"]:
+            # Run once in the foreground so the command exits with the repository up to date
+            try:
+                added = model_sync.sync_once()
+            except Exception as e:
+                raise CommandError(f"Model repository sync failed: {e}")
+            self.stdout.write(f"Synced model versions: {', '.join(added) or 'none new'}")
+
+        if not warm_up_serving(sync_repo=False):
+            raise CommandError("Model warm-up failed")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Model {model_holder.stats()['active']} ready in {time.perf_counter() - started:.2f}s"
+        ))
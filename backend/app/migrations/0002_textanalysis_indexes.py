@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='textanalysis',
+            index=models.Index(fields=['created_at'], name='analysis_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='textanalysis',
+            index=models.Index(fields=['toxic', 'created_at'], name='analysis_toxic_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='textanalysis',
+            index=models.Index(condition=models.Q(('severe_toxic', True)), fields=['created_at'], name='analysis_severe_toxic_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='textanalysis',
+            index=models.Index(condition=models.Q(('obscene', True)), fields=['created_at'], name='analysis_obscene_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='textanalysis',
+            index=models.Index(condition=models.Q(('threat', True)), fields=['created_at'], name='analysis_threat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='textanalysis',
+            index=models.Index(condition=models.Q(('insult', True)), fields=['created_at'], name='analysis_insult_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='textanalysis',
+            index=models.Index(condition=models.Q(('identity_hate', True)), fields=['created_at'], name='analysis_identity_hate_idx'),
+        ),
+    ]
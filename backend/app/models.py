@@ -1,7 +1,50 @@
 # Import necessary modules and classes
-from django.db import models
+import re
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
 
+# FTS5 index over TextAnalysis.text, created and kept in sync by migration 0003 (SQLite only)
+FTS_TABLE = 'moderation_textanalysis_fts'
+
+
+def fts_query(search_query):
+    """Turn free text into an FTS5 query matching every word as a prefix, or None if it has no words.
+
+    Quoting each word keeps FTS5 operators and punctuation in user input from
+    being interpreted.
+    """
+    words = re.findall(r"\w+", search_query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class TextAnalysisQuerySet(models.QuerySet):
+    def search(self, search_query):
+        """Rows whose text matches `search_query`, best matches first.
+
+        On SQLite this looks the words up in the FTS5 index and orders by its
+        bm25 rank, so latency does not grow with the table. Elsewhere, or for
+        queries without any word, it falls back to a substring match.
+        """
+        match = fts_query(search_query)
+        if match is None or connections[self.db].vendor != 'sqlite':
+            return self.filter(text__icontains=search_query)
+
+        # Join the index on rowid so one FTS lookup yields both the matches and their rank.
+        # bm25() rather than the rank column, as only the function can be filtered on (keyset pages)
+        # extra() is a last resort here: the ORM has no way to join a table that has no model.
+        # The index is kept in sync by the triggers of migration 0003. A later migration that
+        # makes SQLite rebuild moderation_textanalysis (altering or dropping a column) drops
+        # those triggers with the old table, so it must run the CREATE TRIGGER statements again.
+        table = self.model._meta.db_table
+        return self.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {table}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        ).annotate(search_rank=RawSQL(f"bm25({FTS_TABLE})", (), output_field=models.FloatField())).order_by("search_rank", "-created_at", "-id")
+
 # Define the TextAnalysis model to store text and its analysis results
 class TextAnalysis(models.Model):
     text = models.TextField()
@@ -21,6 +64,8 @@ class TextAnalysis(models.Model):
     identity_hate = models.BooleanField(default=False)
     identity_hate_probability = models.FloatField(default=0.0)
 
+    objects = TextAnalysisQuerySet.as_manager()
+
     # Meta class to define model-specific options    
     class Meta:
         db_table = 'moderation_textanalysis'
@@ -28,6 +73,18 @@ class TextAnalysis(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Text Analysis'
         verbose_name_plural = 'Text Analyses'
+        indexes = [
+            # Newest-first listing on the home page and the dashboard
+            models.Index(fields=['created_at'], name='analysis_created_idx'),
+            # Home page toxic/clean filter, already in listing order
+            models.Index(fields=['toxic', 'created_at'], name='analysis_toxic_created_idx'),
+            # Dashboard label filters: flagged rows are rare, so index only those
+            models.Index(fields=['created_at'], condition=models.Q(severe_toxic=True), name='analysis_severe_toxic_idx'),
+            models.Index(fields=['created_at'], condition=models.Q(obscene=True), name='analysis_obscene_idx'),
+            models.Index(fields=['created_at'], condition=models.Q(threat=True), name='analysis_threat_idx'),
+            models.Index(fields=['created_at'], condition=models.Q(insult=True), name='analysis_insult_idx'),
+            models.Index(fields=['created_at'], condition=models.Q(identity_hate=True), name='analysis_identity_hate_idx'),
+        ]
 
     # Define how the model instance is represented as a string
     def __str__(self):
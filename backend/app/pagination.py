@@ -0,0 +1,154 @@
+# Import necessary modules and classes
+import base64
+import binascii
+import json
+from datetime import datetime
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Max, Min, Q
+from config.config import PAGE_COUNT_CAP
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset, in the queryset's own order."""
+
+    def __init__(self, items, next_cursor, previous_cursor, estimated_total, total_is_exact):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.estimated_total = estimated_total
+        self.total_is_exact = total_is_exact
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(values):
+    """Opaque URL-safe cursor holding the ordering values of a row."""
+    payload = [{"dt": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Ordering values stored in `cursor`, or None when it cannot be read."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return [datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value for value in payload]
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeEncodeError):
+        return None
+
+
+def ordering_keys(queryset):
+    """(field, descending) pairs of the queryset ordering, ending with the primary key as tie-breaker."""
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    keys = [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+    if not any(name in ("id", "pk") for name, _ in keys):
+        keys.append(("id", keys[-1][1] if keys else True))
+    return keys
+
+
+def clean_cursor_values(queryset, keys, values):
+    """`values` converted to the types of the ordering fields, or None when a cursor was tampered with."""
+    if values is None or len(values) != len(keys):
+        return None
+    cleaned = []
+    for (name, _), value in zip(keys, values):
+        if value is None:
+            return None
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations such as the search rank
+            field = queryset.query.annotations[name].output_field
+        try:
+            cleaned.append(field.to_python(value))
+        except (ValidationError, TypeError, ValueError):
+            return None
+    return cleaned
+
+
+def seek(keys, values, forward):
+    """Filter for the rows after (`forward`) or before the row with ordering `values`.
+
+    The first key is also bounded on its own, so the database can range-scan
+    its index instead of evaluating the OR for every row.
+    """
+    def beyond(index):
+        name, descending = keys[index]
+        lookup = "lt" if descending == forward else "gt"
+        condition = Q(**{f"{name}__{lookup}": values[index]})
+        if index + 1 < len(keys):
+            condition |= Q(**{name: values[index]}) & beyond(index + 1)
+        return condition
+
+    name, descending = keys[0]
+    bound = Q(**{f"{name}__{'lte' if descending == forward else 'gte'}": values[0]})
+    return bound & beyond(0)
+
+
+def estimate_total(queryset, cap=PAGE_COUNT_CAP):
+    """Row count of `queryset`: exact up to `cap` rows, estimated beyond so the cost stays bounded.
+
+    The estimate scales the share of matching rows among the `cap` newest ids
+    to the id range of the table. Returns the count and whether it is exact.
+    """
+    queryset = queryset.order_by()
+    counted = queryset[:cap + 1].count()
+    if counted <= cap:
+        return counted, True
+
+    # Separate MIN and MAX queries, as each alone is a single primary key lookup on SQLite
+    table = queryset.model.objects.using(queryset.db)
+    low, high = table.aggregate(low=Min("id"))["low"], table.aggregate(high=Max("id"))["high"]
+    recent = queryset.filter(id__gt=high - cap).count()
+    table_rows = high - low + 1
+    return max(cap + 1, round(table_rows * recent / cap)), False
+
+
+def keyset_page(queryset, after=None, before=None, per_page=10):
+    """Return the page of `queryset` following cursor `after`, preceding cursor `before`, or the first one.
+
+    Pages are located by the ordering values of their edge rows rather than
+    an OFFSET, so every page costs one indexed range read however deep it is.
+    An unreadable cursor gives the first page.
+    """
+    keys = ordering_keys(queryset)
+    names = [name for name, _ in keys]
+    ordered = queryset.order_by(*[f"-{name}" if descending else name for name, descending in keys])
+
+    values = clean_cursor_values(queryset, keys, decode_cursor(before or after or ""))
+
+    if values is not None and before:
+        # Walk the reverse order back from the cursor, then flip the page
+        reverse = queryset.order_by(*[name if descending else f"-{name}" for name, descending in keys])
+        rows = list(reverse.filter(seek(keys, values, forward=False))[:per_page + 1])
+        items = rows[:per_page][::-1]
+        more_before, more_after = len(rows) > per_page, True
+    else:
+        if values is not None:
+            ordered = ordered.filter(seek(keys, values, forward=True))
+        rows = list(ordered[:per_page + 1])
+        items = rows[:per_page]
+        more_before, more_after = values is not None, len(rows) > per_page
+
+    def cursor_of(row):
+        return encode_cursor([getattr(row, name) for name in names])
+
+    total, exact = estimate_total(queryset)
+    return KeysetPage(
+        items,
+        next_cursor=cursor_of(items[-1]) if items and more_after else None,
+        previous_cursor=cursor_of(items[0]) if items and more_before else None,
+        estimated_total=total,
+        total_is_exact=exact,
+    )
@@ -6,4 +6,8 @@ from app import views
 urlpatterns = [
     path('', views.home, name='home'),
     path('analyze/', views.analyze_text, name='analyze_text'),
+    path('analyze/async/', views.analyze_text_async, name='analyze_text_async'),
+    path('analyze/bulk/', views.analyze_bulk, name='analyze_bulk'),
+    path('stats/', views.inference_stats, name='inference_stats'),
+    path('ready/', views.readiness, name='readiness'),
 ]
@@ -1,75 +1,97 @@
 # Import necessary modules and classes
-import os
+import json
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render
-from django.http import JsonResponse
-from django.core.paginator import Paginator
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from transformers import BertTokenizer, BertForSequenceClassification, BertTokenizerFast  # Added BertTokenizerFast
-import torch
 from .models import TextAnalysis
+from .pagination import keyset_page
+from .batching import batcher, inference_executor, InferenceQueueFull
+from .result_cache import ResultCache, result_cache, in_flight
+from .admission import admission, AdmissionRejected
+from .write_buffer import analysis_writes
 from config.model_manager import ModelManager
-from django.core.cache import cache
+from config.model_holder import model_holder, ModelLoadError
+from config.warmup import start_warm_up
+from config.config import (
+    HIGHLIGHT_MODE, BATCHING_ENABLED, RESULT_CACHE_ENABLED, BULK_MAX_TEXTS, BULK_CHUNK_SIZE,
+    LONG_TEXT_MODE, MAX_LEN, WINDOW_STRIDE, WINDOW_AGGREGATION, WRITE_BEHIND_ENABLED, BULK_MAX_BODY_MB
+)
 from backend.config.logger import logger
 
 
-# Fix the model path to match your actual directory
-tokenizer = None
-model = None
+# The inference helpers import torch, so they are imported where inference
+# runs rather than here; management commands that load the URLconf stay fast
 
-# Function to load the model and tokenizer
-def load_model():
-    """Load the model and tokenizer with the current version."""
-    global tokenizer, model
-    try:
-        model_path = ModelManager.get_model_path()
-        logger.info(f"Resolved model path: {model_path}")
-        
-        # Validate model path
-        if not os.path.exists(os.path.join(model_path, "config.json")):
-            raise FileNotFoundError(f"Model files missing at {model_path}")
-        
-        # Check cache
-        cached_model_path = cache.get("model_path")
-        if cached_model_path != model_path:
-            logger.info(f"Model path updated. Reloading model from: {model_path}")
-            cache.delete("model")
-            cache.delete("tokenizer")
-            cache.set("model_path", model_path)
-
-        if cache.get('model') is None:
-            # Use BertTokenizer instead of BertTokenizerFast
-            tokenizer = BertTokenizer.from_pretrained(
-                model_path, 
-                local_files_only=True,
-                use_fast=False  # Explicitly disable fast tokenizer
-            )
-            
-            # Load model with additional parameters to handle large files
-            model = BertForSequenceClassification.from_pretrained(
-                model_path,
-                local_files_only=True,
-                low_cpu_mem_usage=True,
-                torch_dtype=torch.float32,  # Explicitly set dtype
-                revision="main"
-            )
-            
-            model.eval()
-            cache.set('model', model)
-            cache.set('tokenizer', tokenizer)
-            logger.info(f"Model loaded successfully from: {model_path}")
-        else:
-            tokenizer = cache.get('tokenizer')
-            model = cache.get('model')
-            
-        return True
 
-    except Exception as e:
-        logger.error(f"Error loading model: {e}")
-        return False
+def long_text_window():
+    """Tokenization settings for texts longer than the model input."""
+    from .inference import window_settings
+    return window_settings(LONG_TEXT_MODE, MAX_LEN, WINDOW_STRIDE, WINDOW_AGGREGATION)
+
+
+def make_predict(loaded):
+    """Return the function scoring texts with `loaded`."""
+    from .inference import predict_probabilities
+    model, tokenizer = loaded.model, loaded.tokenizer
+    window = long_text_window()
+
+    # Share the forward passes with concurrent requests when batching is enabled
+    if BATCHING_ENABLED:
+        return lambda texts: batcher.predict(model, tokenizer, texts, window)
+    return lambda texts: predict_probabilities(model, tokenizer, texts, **window)
+
+
+def run_analysis(loaded, text, version, cache_key):
+    """Analyse `text` with the given loaded model and cache the result."""
+    from .inference import analyze, HIGHLIGHT_WORDS
+
+    # Attribution needs gradients, which quantized backends cannot provide
+    highlight_mode = HIGHLIGHT_MODE if loaded.supports_gradients else HIGHLIGHT_WORDS
+    result = analyze(
+        loaded.model, loaded.tokenizer, text, highlight_mode, make_predict(loaded), **long_text_window()
+    )
+
+    if RESULT_CACHE_ENABLED:
+        result_cache.set(version, cache_key, result)
+    return result
+
+
+def get_analysis(text, deadline=None):
+    """Return the analysis of `text`, from the result cache or by running the active model.
 
-# Load initial model
-load_model()
+    Inference is only started when admission control expects it to finish
+    before `deadline`; otherwise AdmissionRejected is raised. Requests
+    coalesced onto an identical in-flight text do not take a queue slot.
+    """
+    # A version change is loaded in the background; until then the current model keeps serving
+    with model_holder.acquire_active(ModelManager.get_model_path()) as loaded:
+        version = loaded.version
 
+        # Serve repeated texts from the result cache without touching the model
+        cache_key = ResultCache.make_key(text, HIGHLIGHT_MODE)
+        result = result_cache.get(version, cache_key) if RESULT_CACHE_ENABLED else None
+
+        if result is None:
+            def admitted_analysis():
+                # Shed load up front rather than answering after the client gave up
+                with admission.admit(deadline):
+                    return run_analysis(loaded, text, version, cache_key)
+
+            # Identical texts arriving together wait for one inference and share it;
+            # only that one inference is admitted and counted in the queue
+            result = in_flight.do((version, cache_key), admitted_analysis)
+    return result
+
+
+def request_deadline(request):
+    """Deadline of a request from its X-Deadline-Ms header, or the configured default."""
+    try:
+        deadline_ms = int(request.headers.get("X-Deadline-Ms", 0))
+    except ValueError:
+        deadline_ms = 0
+    return admission.deadline(deadline_ms if deadline_ms > 0 else None)
 
 
 # View for the home page
@@ -78,8 +100,8 @@ def home(request):
     filter_type = request.GET.get("filter", "all")
     search_query = request.GET.get("search", "")
 
-    # Base queryset
-    analyses = TextAnalysis.objects.all().order_by("-created_at")
+    # Base queryset, newest first with the id breaking ties for keyset pagination
+    analyses = TextAnalysis.objects.all().order_by("-created_at", "-id")
 
     # Apply filters
     if filter_type == "toxic":
@@ -87,27 +109,114 @@ def home(request):
     elif filter_type == "clean":
         analyses = analyses.filter(toxic=False)
 
-    # Apply search
+    # Apply search, best matches first
     if search_query:
-        analyses = analyses.filter(text__icontains=search_query)
+        analyses = analyses.search(search_query)
 
-    # Pagination
-    paginator = Paginator(analyses, 10)  # Show 10 items per page
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination: `after`/`before` cursors instead of page numbers, and an estimated total
+    page = keyset_page(analyses, request.GET.get("after"), request.GET.get("before"), per_page=10)
 
     return render(request, "moderation/home.html", {
-        "analyses": page_obj,
-        "total_count": analyses.count(),
+        "analyses": page,
+        "total_count": page.estimated_total,
+        "total_is_exact": page.total_is_exact,
         "filter_type": filter_type,
         "search_query": search_query,
     })
 
+def build_analysis(text, results):
+    """Build an unsaved TextAnalysis row from the per-label results of `text`."""
+    return TextAnalysis(
+        text=text,
+        toxic=results["toxic"]["toxic"],
+        toxic_probability=results["toxic"]["probability"],
+        severe_toxic=results["severe_toxic"]["toxic"],
+        severe_toxic_probability=results["severe_toxic"]["probability"],
+        obscene=results["obscene"]["toxic"],
+        obscene_probability=results["obscene"]["probability"],
+        threat=results["threat"]["toxic"],
+        threat_probability=results["threat"]["probability"],
+        insult=results["insult"]["toxic"],
+        insult_probability=results["insult"]["probability"],
+        identity_hate=results["identity_hate"]["toxic"],
+        identity_hate_probability=results["identity_hate"]["probability"],
+    )
+
+def wants_sync_write(request):
+    """Whether the caller asked (`?sync=1`) for the analysis to be stored before the response, to get its id."""
+    return not WRITE_BEHIND_ENABLED or request.GET.get("sync") == "1"
+
+
+def analysis_response(text, analysis_result, analysis):
+    """JSON response for an analysis; its id is None while it waits in the write-behind buffer."""
+    results, word_results, highlighted_text = analysis_result
+    return JsonResponse({
+        "success": True,
+        "results": results,
+        "flagged_words": word_results,
+        "highlighted_text": highlighted_text,
+        "text": text,
+        "id": analysis.id,
+    })
+
+
+def analysis_error_response(error):
+    """JSON response for an analysis that failed with `error`."""
+    if isinstance(error, ModelLoadError):
+        logger.error(f"Error loading model: {error}")
+        return JsonResponse({"error": "BERT model not loaded properly"})
+
+    if isinstance(error, AdmissionRejected):
+        logger.warning(f"Shedding analysis request: {error}")
+        response = JsonResponse({"error": "Server is overloaded, please retry later"}, status=429)
+        response["Retry-After"] = str(error.retry_after)
+        return response
+
+    if isinstance(error, InferenceQueueFull):
+        logger.warning(f"Rejecting analysis request: {error}")
+        response = JsonResponse({"error": "Server is busy, please retry shortly"}, status=503)
+        response["Retry-After"] = "1"
+        return response
+
+    return JsonResponse({
+        "error": f"Error analyzing text: {str(error)}"
+    })
+
 # View to analyse text
 @csrf_exempt
 def analyze_text(request):
-    global tokenizer, model
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"})
+
+    text = request.POST.get("text", "").strip()
+    if not text:
+        return JsonResponse({"error": "No text provided"})
+
+    try:
+        analysis_result = get_analysis(text, request_deadline(request))
 
+        # Save to database, or leave it to the write-behind buffer
+        analysis = build_analysis(text, analysis_result[0])
+        if wants_sync_write(request):
+            analysis.save()
+        else:
+            analysis_writes.add(analysis)
+
+        return analysis_response(text, analysis_result, analysis)
+
+    except Exception as e:
+        return analysis_error_response(e)
+
+# Async view to analyse text, for ASGI servers
+@csrf_exempt
+async def analyze_text_async(request):
+    """Same contract as `analyze_text`, without blocking the event loop.
+
+    Inference runs on the bounded inference executor and the row is queued
+    for the write-behind buffer (or, with `?sync=1`, written through Django's
+    async ORM), so the loop stays free to serve other connections while the
+    CPU works.
+    """
     if request.method != "POST":
         return JsonResponse({"error": "Invalid request method"})
 
@@ -115,122 +224,231 @@ def analyze_text(request):
     if not text:
         return JsonResponse({"error": "No text provided"})
 
-    # Check if we need to reload the model
-    current_model_path = ModelManager.get_model_path()
-    if model is None or current_model_path != getattr(model, '_model_path', None):
-        if not load_model():
-            return JsonResponse({"error": "BERT model not loaded properly"})
-        # Store the path we loaded from
-        model._model_path = current_model_path
-    
     try:
-        # Split text into words
-        words = text.split()
-        word_results = []
-        highlighted_text = ""
-
-        # Analyze each word individually
-        for word in words:
-            inputs = tokenizer(
-                word,
-                return_tensors="pt",
-                truncation=True,
-                padding=True,
-                max_length=512
-            )
-
-            # Get predictions for individual word
-            with torch.no_grad():
-                outputs = model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.sigmoid(logits).squeeze().tolist()
-                
-                if isinstance(probabilities, float):
-                    probabilities = [probabilities]
-
-            # Check if word is toxic, threat, or insult
-            labels = ["toxic", "severe_toxic", "obscene", "threat", "insult", "identity_hate"]
-            word_flags = {label: False for label in labels}
-
-            for idx, label in enumerate(labels):
-                if idx < len(probabilities):
-                    probability = float(probabilities[idx])
-                    if probability > 0.5:
-                        word_flags[label] = True
-
-            if any(word_flags.values()):
-                word_results.append({
-                    "word": word,
-                    **word_flags
-                })
-                # Highlight toxic words
-                highlighted_text += f'<span class="text-red-600 font-bold">{word}</span> '
-            else:
-                highlighted_text += f"{word} "
-
-            print(f"Flagged words: {word_results}")  # Debugging output
-
-        # Original full text analysis
-        inputs = tokenizer(
-            text,
-            return_tensors="pt",
-            truncation=True,
-            padding=True,
-            max_length=512
-        )
-
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
-            probabilities = torch.sigmoid(logits).squeeze().tolist()
-            
-            if isinstance(probabilities, float):
-                probabilities = [probabilities]
-
-        labels = ["toxic", "severe_toxic", "obscene", "threat", "insult", "identity_hate"]
-        results = {}
-
-        for idx, label in enumerate(labels):
-            if idx < len(probabilities):
-                probability = float(probabilities[idx])
-                is_toxic = probability > 0.5
-                results[label] = {
-                    "toxic": is_toxic,
-                    "probability": probability
-                }
-            else:
-                results[label] = {
-                    "toxic": False,
-                    "probability": 0.0
-                }
-
-        # Save to database
-        analysis = TextAnalysis.objects.create(
-            text=text,
-            toxic=results["toxic"]["toxic"],
-            toxic_probability=results["toxic"]["probability"],
-            severe_toxic=results["severe_toxic"]["toxic"],
-            severe_toxic_probability=results["severe_toxic"]["probability"],
-            obscene=results["obscene"]["toxic"],
-            obscene_probability=results["obscene"]["probability"],
-            threat=results["threat"]["toxic"],
-            threat_probability=results["threat"]["probability"],
-            insult=results["insult"]["toxic"],
-            insult_probability=results["insult"]["probability"],
-            identity_hate=results["identity_hate"]["toxic"],
-            identity_hate_probability=results["identity_hate"]["probability"],
-        )
-
-        return JsonResponse({
-            "success": True,
-            "results": results,
-            "flagged_words": word_results,
-            "highlighted_text": highlighted_text.strip(),
-            "text": text,
-            "id": analysis.id,
-        })
+        analysis_result = await inference_executor.run(get_analysis, text, request_deadline(request))
+
+        # Save to database, or leave it to the write-behind buffer
+        analysis = build_analysis(text, analysis_result[0])
+        if wants_sync_write(request):
+            await analysis.asave()
+        else:
+            analysis_writes.add(analysis)
+
+        return analysis_response(text, analysis_result, analysis)
 
     except Exception as e:
-        return JsonResponse({
-            "error": f"Error analyzing text: {str(e)}"
-        })
\ No newline at end of file
+        return analysis_error_response(e)
+
+# Content types accepted as one JSON document per line by the bulk endpoint
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class BulkBodyTooLarge(ValueError):
+    """Raised when a bulk request body exceeds BULK_MAX_BODY_MB"""
+
+
+def read_bulk_body(request):
+    """Yield the lines of a bulk request body from the request stream.
+
+    `request.body` would be capped at DATA_UPLOAD_MAX_MEMORY_SIZE (2.5 MB),
+    far below BULK_MAX_TEXTS real comments, so the stream is read directly
+    under the bulk endpoint's own BULK_MAX_BODY_MB limit.
+    """
+    limit = BULK_MAX_BODY_MB * 1024 * 1024
+    size = 0
+    for line in request:
+        size += len(line)
+        if size > limit:
+            raise BulkBodyTooLarge(f"Request body too large, at most {BULK_MAX_BODY_MB} MB are accepted")
+        yield line
+
+
+def parse_bulk_items(request):
+    """Read the texts of a bulk request as a list of (text, error) pairs.
+
+    The body is either a JSON array or NDJSON, one item per line. Each item
+    is a string or an object with a "text" field. Raises ValueError when the
+    body itself cannot be read.
+    """
+    if request.content_type in NDJSON_CONTENT_TYPES:
+        # Parsed line by line, so the body is never held as one string
+        items = []
+        for line in read_bulk_body(request):
+            line = line.decode("utf-8")
+            if not line.strip():
+                continue
+            if len(items) == BULK_MAX_TEXTS:
+                raise ValueError(f"Too many texts, at most {BULK_MAX_TEXTS} are accepted per request")
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                items.append(ValueError(f"Invalid JSON line: {e}"))
+    else:
+        try:
+            items = json.loads(b"".join(read_bulk_body(request)).decode("utf-8"))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array of texts")
+
+    if len(items) > BULK_MAX_TEXTS:
+        raise ValueError(f"Too many texts, at most {BULK_MAX_TEXTS} are accepted per request")
+
+    parsed = []
+    for item in items:
+        if isinstance(item, ValueError):
+            parsed.append((None, str(item)))
+            continue
+
+        text = item.get("text") if isinstance(item, dict) else item
+        if not isinstance(text, str) or not text.strip():
+            parsed.append((None, "No text provided"))
+        else:
+            parsed.append((text.strip(), None))
+    return parsed
+
+
+def bulk_chunks(items):
+    """Split bulk items into chunks of BULK_CHUNK_SIZE (index, (text, error)) pairs."""
+    for start in range(0, len(items), BULK_CHUNK_SIZE):
+        yield list(enumerate(items[start:start + BULK_CHUNK_SIZE], start))
+
+
+def failed_bulk_records(chunk, error):
+    """Records of a chunk whose valid texts all failed with `error`."""
+    return {index: {"index": index, "error": item_error or error} for index, (text, item_error) in chunk}
+
+
+def analyze_bulk_chunk(chunk, highlight=True):
+    """Analyse the valid texts of one chunk in shared forward passes.
+
+    Returns the records keyed by index and, for every successful text, its
+    record together with the unsaved TextAnalysis row.
+    """
+    from .inference import analyze_batch
+
+    valid = [(index, text) for index, (text, error) in chunk if error is None]
+    records = {index: {"index": index, "error": error} for index, (text, error) in chunk if error is not None}
+    rows = []
+    if not valid:
+        return records, rows
+
+    try:
+        with model_holder.acquire_active(ModelManager.get_model_path()) as loaded:
+            analyses = analyze_batch(make_predict(loaded), [text for _, text in valid], highlight)
+    except ModelLoadError as e:
+        logger.error(f"Error loading model: {e}")
+        return failed_bulk_records(chunk, "BERT model not loaded properly"), []
+    except InferenceQueueFull as e:
+        logger.warning(f"Rejecting bulk analysis chunk: {e}")
+        return failed_bulk_records(chunk, "Server is busy, please retry shortly"), []
+    except Exception as e:
+        logger.error(f"Error analyzing bulk chunk: {e}")
+        return failed_bulk_records(chunk, f"Error analyzing text: {str(e)}"), []
+
+    for (index, text), (results, word_results, highlighted_text) in zip(valid, analyses):
+        record = {"index": index, "success": True, "results": results, "id": None}
+        if highlight:
+            record["flagged_words"] = word_results
+            record["highlighted_text"] = highlighted_text
+        records[index] = record
+        rows.append((record, build_analysis(text, results)))
+    return records, rows
+
+
+def save_bulk_rows(rows):
+    """Store the rows of one chunk with a single INSERT and put their ids in the records."""
+    try:
+        saved = TextAnalysis.objects.bulk_create([row for _, row in rows])
+    except Exception as e:
+        logger.error(f"Error storing bulk chunk: {e}")
+        for record, _ in rows:
+            index = record["index"]
+            record.clear()
+            record.update({"index": index, "error": f"Error analyzing text: {str(e)}"})
+        return
+    for (record, _), row in zip(rows, saved):
+        record["id"] = row.id
+
+
+def bulk_lines(chunk, records):
+    """NDJSON lines of a chunk's records, in input order."""
+    return "".join(json.dumps(records[index]) + "\n" for index, _ in chunk)
+
+
+def stream_bulk_analysis(items, highlight=True, save=True):
+    """Analyse bulk items chunk by chunk and yield one NDJSON line per item, in input order."""
+    for chunk in bulk_chunks(items):
+        records, rows = analyze_bulk_chunk(chunk, highlight)
+        if save and rows:
+            save_bulk_rows(rows)
+        yield bulk_lines(chunk, records)
+
+
+async def astream_bulk_analysis(items, highlight=True, save=True):
+    """Async variant of `stream_bulk_analysis` for ASGI servers.
+
+    Django drains synchronous iterators completely before sending anything
+    under ASGI, so each chunk is analysed on the inference executor and
+    yielded as soon as it finishes.
+    """
+    for chunk in bulk_chunks(items):
+        try:
+            records, rows = await inference_executor.run(analyze_bulk_chunk, chunk, highlight)
+        except InferenceQueueFull as e:
+            logger.warning(f"Rejecting bulk analysis chunk: {e}")
+            records, rows = failed_bulk_records(chunk, "Server is busy, please retry shortly"), []
+        if save and rows:
+            await sync_to_async(save_bulk_rows)(rows)
+        yield bulk_lines(chunk, records)
+
+
+# View to analyse many texts in one request
+@csrf_exempt
+def analyze_bulk(request):
+    """Analyse a JSON array or NDJSON stream of texts and stream the results back as NDJSON.
+
+    Query parameters: `highlight=0` skips per-word highlighting and `save=0`
+    skips storing the analyses.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    try:
+        items = parse_bulk_items(request)
+    except BulkBodyTooLarge as e:
+        return JsonResponse({"error": str(e)}, status=413)
+    except (ValueError, UnicodeDecodeError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    highlight = request.GET.get("highlight", "1") != "0"
+    save = request.GET.get("save", "1") != "0"
+    # ASGI servers stream async iterators chunk by chunk; WSGI servers stream sync ones
+    stream = astream_bulk_analysis if isinstance(request, ASGIRequest) else stream_bulk_analysis
+    return StreamingHttpResponse(stream(items, highlight, save), content_type="application/x-ndjson")
+
+# Readiness probe
+def readiness(request):
+    """200 once the active model has finished its warm-up inference, 503 until then.
+
+    A probe that finds the process cold starts the warm-up in the background,
+    so servers without a preloading master become ready without a request
+    having to pay for the model load.
+    """
+    if model_holder.is_ready():
+        return JsonResponse({"ready": True, "model": model_holder.stats()["active"]})
+
+    start_warm_up()
+    return JsonResponse({"ready": False}, status=503)
+
+# View exposing inference counters
+def inference_stats(request):
+    """Report model pool, result cache and request coalescing counters for monitoring."""
+    return JsonResponse({
+        "model_pool": model_holder.stats(),
+        "result_cache": result_cache.stats(),
+        "in_flight": in_flight.stats(),
+        "async_executor": inference_executor.stats(),
+        "admission": admission.stats(),
+        "write_behind": analysis_writes.stats(),
+    })
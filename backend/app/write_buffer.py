@@ -0,0 +1,130 @@
+# Import necessary modules and classes
+import atexit
+import threading
+import time
+from django.db import close_old_connections
+from .models import TextAnalysis
+from config.config import WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_FLUSH_INTERVAL, WRITE_BEHIND_MAX_PENDING
+from backend.config.logger import logger
+
+
+class WriteBehindBuffer:
+    """Queues unsaved rows in memory and stores them with `bulk_create` from a background thread.
+
+    A flush runs once `batch_size` rows are queued or the oldest row has
+    waited `flush_interval` seconds, so requests never wait on the database
+    write. Rows that fail to be written are put back for the next flush while
+    fewer than `max_pending` are queued, and dropped with an error after
+    that. When more than `max_pending` rows are queued, the adding request
+    flushes itself, which slows writers down instead of growing the queue.
+    """
+
+    def __init__(self, model, batch_size=WRITE_BEHIND_BATCH_SIZE, flush_interval=WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_pending=WRITE_BEHIND_MAX_PENDING):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = []
+        self._condition = threading.Condition()
+        # Keeps flushes in order and one at a time
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self.queued = 0
+        self.written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+
+    def add(self, row):
+        """Queue an unsaved row for the next flush."""
+        with self._condition:
+            self._pending.append(row)
+            self.queued += 1
+            overflowing = len(self._pending) > self.max_pending
+            self._ensure_thread()
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+
+        if overflowing:
+            logger.warning(f"Write-behind buffer holds over {self.max_pending} rows, flushing in the request")
+            self.flush()
+
+    def _ensure_thread(self):
+        """Start the flusher on first use, so each forked worker gets its own. Caller holds the condition."""
+        if self._stopping or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Background loop: wait for a full batch or the flush interval, then flush."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping or len(self._pending) >= self.batch_size, self.flush_interval
+                )
+                stopping = self._stopping
+
+            failures = self.failed_flushes
+            self.flush()
+            if self.failed_flushes > failures and not stopping:
+                time.sleep(self.flush_interval)  # Back off while the database is failing
+            # The thread keeps a connection like a request does, so close it once it expires
+            close_old_connections()
+            if stopping:
+                return
+
+    def flush(self):
+        """Write every queued row now. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._condition:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+
+            try:
+                self.model.objects.bulk_create(rows, batch_size=self.batch_size)
+            except Exception as e:
+                self.failed_flushes += 1
+                with self._condition:
+                    if len(self._pending) + len(rows) <= self.max_pending:
+                        logger.error(f"Failed to store {len(rows)} buffered rows, retrying: {e}")
+                        self._pending[:0] = rows
+                    else:
+                        logger.error(f"Failed to store {len(rows)} buffered rows, dropping them: {e}")
+                        self.dropped += len(rows)
+                return 0
+
+            self.flushes += 1
+            self.written += len(rows)
+            return len(rows)
+
+    def stop(self, timeout=10):
+        """Flush what is queued and stop the background thread, e.g. on shutdown."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        """Return buffer counters for monitoring."""
+        with self._condition:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "queued": self.queued,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "dropped": self.dropped,
+        }
+
+
+# Process-wide buffer of analyses waiting to be stored, flushed on interpreter exit
+analysis_writes = WriteBehindBuffer(TextAnalysis)
+atexit.register(analysis_writes.stop)
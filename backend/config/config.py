@@ -8,6 +8,35 @@ MODEL_NAME = "bert-base-uncased"  # Use base BERT model
 MAX_LEN = 128  # MAX_LEN of the input tokens
 BATCH_SIZE = 32  # Number of samples in each training batch
 
+# Inference Configuration
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")  # "torch" (float32), "quantized" (dynamic int8) or "onnx" (ONNX Runtime)
+MODEL_POOL_MEMORY_MB = int(os.getenv("MODEL_POOL_MEMORY_MB", 2048))  # Memory budget for model versions kept resident
+LONG_TEXT_MODE = os.getenv("LONG_TEXT_MODE", "truncate")  # "truncate" keeps the first 512 tokens, "window" scores MAX_LEN-token windows
+WINDOW_STRIDE = int(os.getenv("WINDOW_STRIDE", 32))  # Tokens shared by consecutive windows
+WINDOW_AGGREGATION = os.getenv("WINDOW_AGGREGATION", "max")  # Combine window probabilities by "max" or "mean"
+HIGHLIGHT_MODE = os.getenv("HIGHLIGHT_MODE", "words")  # "words" scores each word, "attribution" reuses the full-text pass
+BATCHING_ENABLED = os.getenv("BATCHING_ENABLED", "1") == "1"  # Share forward passes across concurrent requests
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 32))  # Maximum number of texts scored in one forward pass
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", 5))  # How long the batcher waits for more requests
+BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", 64))  # Pending requests allowed before new ones are rejected
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", 128))  # Requests allowed waiting for or running inference
+ADMISSION_DEADLINE_MS = int(os.getenv("ADMISSION_DEADLINE_MS", 2000))  # Default time budget, clients may send X-Deadline-Ms
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", 0))  # Intra-op threads per concurrent inference, 0 splits the CPU quota evenly
+ASYNC_INFERENCE_WORKERS = int(os.getenv("ASYNC_INFERENCE_WORKERS", 4))  # Threads running inference for the async analyze view
+ASYNC_MAX_PENDING = int(os.getenv("ASYNC_MAX_PENDING", 64))  # Async analyses allowed in flight before new ones are rejected
+BULK_MAX_TEXTS = int(os.getenv("BULK_MAX_TEXTS", 10000))  # Maximum number of texts accepted by one bulk request
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 64))  # Texts analysed and streamed back together in a bulk request
+BULK_MAX_BODY_MB = int(os.getenv("BULK_MAX_BODY_MB", 64))  # Largest bulk request body read, instead of Django's 2.5 MB upload limit
+PAGE_COUNT_CAP = int(os.getenv("PAGE_COUNT_CAP", 1000))  # Rows counted exactly for page totals before estimating
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", 50))  # Analyses shown per admin dashboard page
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "1") == "1"  # Store analyses from a background buffer instead of in the request
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", 100))  # Buffered analyses that trigger a flush
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", 1.0))  # Seconds a buffered analysis waits at most
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", 10000))  # Buffered analyses above which requests write themselves
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"  # Reuse results for repeated texts
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", 10000))  # Maximum number of cached analysis results
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", 3600))  # Seconds a cached result stays valid
+
 # Training Configuration
 LEARNING_RATE = 2e-5  # Step size for the weight model
 EPOCHS = 3  # Number of times the model will be trained on the entire training data
@@ -20,6 +49,9 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')  # Correctly points to backend/data
 MODEL_REPO_PATH = os.path.join(BASE_DIR, 'models')  # Path to model repository
 METRICS_DIR = os.path.join(MODEL_REPO_PATH, 'metrics')    # Path to metrics directory
 MODEL_REPO_URL = "https://github.com/cybersafeai/models"  # Replace with your repo URL
+MODEL_SYNC_INTERVAL = int(os.getenv("MODEL_SYNC_INTERVAL", 300))  # Seconds between background model repo syncs, 0 disables
+MODEL_PINNED_VERSIONS = [v for v in os.getenv("MODEL_PINNED_VERSIONS", "").split(",") if v]  # Versions kept checked out besides the served one
+MODEL_BLOB_CACHE = os.getenv("MODEL_BLOB_CACHE", os.path.join(MODEL_REPO_PATH, '.git'))  # Git directory holding the fetched model blobs
 GIT_BRANCH = "main"  # Default branch name
 
 # Data Paths
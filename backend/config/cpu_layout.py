@@ -0,0 +1,94 @@
+# Import necessary modules and classes
+import math
+import os
+import torch
+from backend.config.logger import logger
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def cgroup_cpu_quota(cgroup_root=CGROUP_ROOT):
+    """Return the container's CPU limit in cores from the cgroup quota, or None when unlimited."""
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    try:
+        with open(os.path.join(cgroup_root, "cpu.max")) as f:
+            quota, period = f.read().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    # cgroup v1: a quota of -1 means unlimited
+    try:
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us")) as f:
+            quota = int(f.read())
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us")) as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def affinity_cpus():
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def available_cpus(cgroup_root=CGROUP_ROOT):
+    """Whole CPUs usable by this container: the affinity mask capped by the cgroup quota."""
+    cpus = affinity_cpus()
+    quota = cgroup_cpu_quota(cgroup_root)
+    if quota is not None:
+        # Round down so the workers together never run into the quota and get throttled
+        cpus = min(cpus, math.floor(quota))
+    return max(1, cpus)
+
+
+def plan_threads(workers=1, concurrent_per_worker=1, intra_op_threads=0, cgroup_root=CGROUP_ROOT):
+    """Split the available CPUs across every inference running at the same time.
+
+    `workers` processes each run up to `concurrent_per_worker` forward passes
+    at once. A positive `intra_op_threads` overrides the computed split.
+    """
+    cpus = available_cpus(cgroup_root)
+    parallel = max(1, workers * concurrent_per_worker)
+    return {
+        "cpus": cpus,
+        "cgroup_quota": cgroup_cpu_quota(cgroup_root),
+        "affinity": affinity_cpus(),
+        "workers": workers,
+        "concurrent_per_worker": concurrent_per_worker,
+        "intra_op_threads": intra_op_threads if intra_op_threads > 0 else max(1, cpus // parallel),
+        "inter_op_threads": 1,  # BERT inference has no independent ops worth running in parallel
+    }
+
+
+def apply_thread_layout(layout):
+    """Pin the torch thread pools of this process to `layout`."""
+    torch.set_num_threads(layout["intra_op_threads"])
+    try:
+        torch.set_num_interop_threads(layout["inter_op_threads"])
+    except RuntimeError:
+        # Only allowed before the inter-op pool has started
+        pass
+    logger.info(f"Inference thread layout: {describe_layout(layout)}")
+    return layout
+
+
+def inference_threads():
+    """Intra-op and inter-op thread counts for inference sessions created in this process.
+
+    Follows the torch pool size, which `apply_thread_layout` pins to the
+    planned share of the CPUs, so other runtimes split the CPUs the same way.
+    """
+    return torch.get_num_threads(), 1
+
+
+def describe_layout(layout):
+    """One-line summary of a thread layout for the startup log."""
+    return (
+        f"{layout['cpus']} CPUs (cgroup quota {layout['cgroup_quota']}, affinity {layout['affinity']}) "
+        f"for {layout['workers']} workers x {layout['concurrent_per_worker']} concurrent inferences: "
+        f"{layout['intra_op_threads']} intra-op / {layout['inter_op_threads']} inter-op threads each"
+    )
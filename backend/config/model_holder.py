@@ -0,0 +1,359 @@
+# Import necessary modules and classes
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from config.config import MODEL_POOL_MEMORY_MB, INFERENCE_BACKEND
+from backend.config.logger import logger
+
+# torch, transformers and the backend modules are imported inside the loading
+# functions, so importing this module (and the views using it) stays cheap for
+# management commands that never load a model
+
+
+class ModelLoadError(Exception):
+    """Raised when a model version cannot be loaded"""
+    def __init__(self, model_path: str = None, error_msg: str = None):
+        self.model_path = model_path
+        self.error_msg = error_msg or "Model load failed"
+
+        detailed_msg = self.error_msg
+        if self.model_path:
+            detailed_msg += f"\nModel path: {self.model_path}"
+
+        super().__init__(detailed_msg)
+
+
+# Inference backends
+BACKEND_TORCH = "torch"  # Eager float32 PyTorch
+BACKEND_QUANTIZED = "quantized"  # Dynamic int8 quantized linear layers on CPU
+BACKEND_ONNX = "onnx"  # ONNX export run by ONNX Runtime on CPU
+
+
+class LoadedModel:
+    """A model and its tokenizer kept alive in this process."""
+
+    def __init__(self, model_path, model, tokenizer, backend=BACKEND_TORCH, nbytes=None):
+        self.model_path = model_path
+        self.version = os.path.basename(model_path)
+        self.model = model
+        self.tokenizer = tokenizer
+        self.backend = backend
+        self.supports_gradients = backend == BACKEND_TORCH  # Needed for attribution highlighting
+        self.refcount = 0  # Number of requests currently using this model
+        self.nbytes = nbytes if nbytes is not None else model_nbytes(model)
+
+
+def model_nbytes(model):
+    """Estimate the resident size of a model from its parameters and buffers."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+def estimate_nbytes(model_path):
+    """Estimate the in-memory size of a saved model from its weight file, before loading it."""
+    for filename in ("model.safetensors", "pytorch_model.bin"):
+        weights_path = os.path.join(model_path, filename)
+        if os.path.exists(weights_path):
+            return os.path.getsize(weights_path)
+    return 0
+
+
+def load_float_model(model_path):
+    """Load the float32 PyTorch model saved at `model_path`."""
+    import torch
+    from transformers import BertForSequenceClassification
+
+    # Load model with additional parameters to handle large files
+    model = BertForSequenceClassification.from_pretrained(
+        model_path,
+        local_files_only=True,
+        low_cpu_mem_usage=True,
+        torch_dtype=torch.float32,  # Explicitly set dtype
+        revision="main"
+    )
+    model.eval()
+    return map_weights(model, model_path)
+
+
+def map_weights(model, model_path):
+    """Back the parameters of `model` with a read-only memory map of its `model.safetensors`.
+
+    The weights then live in the page cache instead of private memory, so
+    every worker process serving the same version shares one copy.
+    """
+    from safetensors.torch import load_file
+
+    weights_path = os.path.join(model_path, "model.safetensors")
+    if not os.path.exists(weights_path):
+        return model
+
+    current = model.state_dict()
+    mapped = {
+        name: tensor for name, tensor in load_file(weights_path).items()
+        if name in current and current[name].dtype == tensor.dtype and current[name].shape == tensor.shape
+    }
+    model.load_state_dict(mapped, strict=False, assign=True)
+    return model
+
+
+def load_pretrained(model_path, backend=INFERENCE_BACKEND):
+    """Load the tokenizer and model saved at `model_path` for the given inference backend."""
+    from transformers import BertTokenizerFast
+    from config.quantization import load_quantized, quantized_artifact_path
+    from config.onnx_backend import load_onnx, onnx_artifact_path
+    from config.cpu_layout import inference_threads
+
+    # Validate model path
+    if not os.path.exists(os.path.join(model_path, "config.json")):
+        raise ModelLoadError(model_path=model_path, error_msg="Model files missing")
+
+    try:
+        # The Rust tokenizer encodes batches natively and maps every token back to its word
+        tokenizer = BertTokenizerFast.from_pretrained(
+            model_path,
+            local_files_only=True
+        )
+
+        if backend == BACKEND_QUANTIZED:
+            model = load_quantized(model_path, lambda: load_float_model(model_path))
+            # Packed int8 weights are not parameters, so size the model by its artifact
+            artifact_path = quantized_artifact_path(model_path)
+            nbytes = os.path.getsize(artifact_path) if os.path.exists(artifact_path) else None
+            return LoadedModel(model_path, model, tokenizer, backend, nbytes=nbytes)
+
+        if backend == BACKEND_ONNX:
+            try:
+                # ONNX Runtime keeps its own thread pools; size them like the torch ones
+                model = load_onnx(model_path, tokenizer, lambda: load_float_model(model_path), *inference_threads())
+                # The session holds the weights outside torch, so size the model by its export
+                nbytes = os.path.getsize(onnx_artifact_path(model_path))
+                return LoadedModel(model_path, model, tokenizer, backend, nbytes=nbytes)
+            except Exception as e:
+                logger.warning(f"ONNX backend unavailable for {model_path}, falling back to PyTorch: {e}")
+                backend = BACKEND_TORCH
+
+        model = load_float_model(model_path)
+    except Exception as e:
+        raise ModelLoadError(model_path=model_path, error_msg=str(e))
+
+    return LoadedModel(model_path, model, tokenizer, backend)
+
+
+def warm_up(loaded):
+    """Run one small inference so the first real request does not pay for lazy initialisation."""
+    import torch
+
+    inputs = loaded.tokenizer(["warm up"], return_tensors="pt", padding=True)
+    with torch.no_grad():
+        loaded.model(**inputs)
+
+
+class ModelHolder:
+    """Process-local pool of loaded models, keyed by version path.
+
+    Models are kept as live objects and never serialised, so looking up a
+    loaded version is a dictionary read. Loading happens at most once per
+    path even when several requests ask for it at the same time. Several
+    versions stay resident until their combined size exceeds the memory
+    budget, at which point the least recently used idle versions are evicted.
+
+    Requests are served by the active model. When a different version is
+    requested it is loaded and warmed up in the background, and the active
+    pointer only switches once it is ready; requests keep using the old
+    model in the meantime.
+    """
+
+    SWAP_RETRY_SECONDS = 30  # Wait before retrying a version that failed to load
+
+    def __init__(self, loader=load_pretrained, memory_budget_mb=MODEL_POOL_MEMORY_MB, warm_up=warm_up):
+        self._loader = loader
+        self._warm_up = warm_up
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        self._active = None
+        self._pending = None
+        self._failed = {}
+        self.evictions = 0
+        self.swaps = 0
+
+    def get(self, model_path):
+        """Return the loaded model for `model_path`, loading it on first use."""
+        loaded = self._models.get(model_path)
+        if loaded is not None:
+            with self._lock:
+                if model_path in self._models:
+                    self._models.move_to_end(model_path)
+            return loaded
+
+        with self._load_lock:
+            # Another request may have finished loading while we waited
+            loaded = self._models.get(model_path)
+            if loaded is None:
+                # Make room first so the old and new weights never exceed the budget together
+                self._evict(reserve=estimate_nbytes(model_path))
+                logger.info(f"Loading model from: {model_path}")
+                loaded = self._loader(model_path)
+                with self._lock:
+                    self._models[model_path] = loaded
+                logger.info(f"Model loaded successfully from: {model_path}")
+                self._evict(keep=model_path)
+        return loaded
+
+    def _evict(self, keep=None, reserve=0):
+        """Evict least recently used idle models until the pool plus `reserve` bytes fits the budget."""
+        with self._lock:
+            for model_path in list(self._models):
+                if self._total_bytes() + reserve <= self.memory_budget:
+                    break
+                loaded = self._models[model_path]
+                if model_path == keep or loaded.refcount > 0 or loaded is self._active:
+                    continue
+                del self._models[model_path]
+                self.evictions += 1
+                logger.info(f"Evicted model {model_path} to stay within the {self.memory_budget} byte budget")
+
+    def _total_bytes(self):
+        """Combined size of all resident models. Caller holds the lock."""
+        return sum(loaded.nbytes for loaded in self._models.values())
+
+    @contextmanager
+    def acquire(self, model_path):
+        """Hold a reference to the model for `model_path` for the duration of the block."""
+        loaded = self.get(model_path)
+        with self._hold(loaded):
+            yield loaded
+
+    @contextmanager
+    def acquire_active(self, model_path):
+        """Hold a reference to the active model, swapping towards `model_path` in the background."""
+        loaded = self.get_active(model_path)
+        with self._hold(loaded):
+            yield loaded
+
+    @contextmanager
+    def _hold(self, loaded):
+        """Count `loaded` as in use for the duration of the block."""
+        with self._lock:
+            loaded.refcount += 1
+        try:
+            yield loaded
+        finally:
+            with self._lock:
+                loaded.refcount -= 1
+
+    def get_active(self, model_path):
+        """Return the model serving requests, scheduling a warm swap if `model_path` differs.
+
+        Only the very first request of the process loads synchronously;
+        after that a version change never blocks a request.
+        """
+        active = self._active
+        if active is None:
+            with self._load_lock:
+                if self._active is None:
+                    loaded = self.get(model_path)
+                    self._warm_up(loaded)
+                    self._active = loaded
+            return self._active
+
+        if active.model_path != model_path:
+            self.activate(model_path)
+        return active
+
+    def after_fork(self):
+        """Recreate inference sessions inherited from the parent process with this process's thread layout.
+
+        ONNX Runtime thread pools do not survive a fork, so sessions created
+        in the gunicorn master are rebuilt in every worker. Returns the
+        number of sessions rebuilt.
+        """
+        from config.cpu_layout import inference_threads
+
+        with self._lock:
+            models = list(self._models.values())
+        rebuilt = 0
+        for loaded in models:
+            if hasattr(loaded.model, "rebuild"):
+                loaded.model.rebuild(*inference_threads())
+                rebuilt += 1
+        if rebuilt and self._active is not None:
+            self._warm_up(self._active)
+        return rebuilt
+
+    def is_ready(self):
+        """True once a model has been loaded and warmed up and is serving requests."""
+        return self._active is not None
+
+    def activate(self, model_path):
+        """Load and warm up `model_path` in the background, then make it the active model.
+
+        Returns False when the version is already active or being swapped in.
+        """
+        with self._lock:
+            active = self._active
+            if (active is not None and active.model_path == model_path) or self._pending == model_path:
+                return False
+            if time.monotonic() < self._failed.get(model_path, 0):
+                return False
+            self._pending = model_path
+
+        threading.Thread(target=self._swap, args=(model_path,), name="model-warm-swap", daemon=True).start()
+        return True
+
+    def _swap(self, model_path):
+        """Background task: load, warm up and atomically switch the active model."""
+        try:
+            loaded = self.get(model_path)
+            self._warm_up(loaded)
+        except Exception as e:
+            logger.error(f"Warm swap to {model_path} failed, keeping the current model: {e}")
+            with self._lock:
+                self._failed[model_path] = time.monotonic() + self.SWAP_RETRY_SECONDS
+                if self._pending == model_path:
+                    self._pending = None
+            return
+
+        with self._lock:
+            self._failed.pop(model_path, None)
+            if self._pending != model_path:
+                return  # A newer version was requested meanwhile
+            self._active = loaded
+            self._pending = None
+            self.swaps += 1
+        logger.info(f"Active model switched to: {model_path}")
+
+    def unload(self, model_path):
+        """Drop the model for `model_path` if no request is using it. Returns True when dropped."""
+        with self._lock:
+            loaded = self._models.get(model_path)
+            if loaded is None or loaded.refcount > 0:
+                return False
+            del self._models[model_path]
+        logger.info(f"Unloaded model: {model_path}")
+        return True
+
+    def loaded_paths(self):
+        """Return the paths of all models currently held in memory, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def stats(self):
+        """Return the resident versions and memory use of the pool."""
+        with self._lock:
+            return {
+                "active": self._active.version if self._active else None,
+                "pending": os.path.basename(self._pending) if self._pending else None,
+                "swaps": self.swaps,
+                "loaded": [os.path.basename(model_path) for model_path in self._models],
+                "resident_bytes": self._total_bytes(),
+                "memory_budget_bytes": self.memory_budget,
+                "evictions": self.evictions,
+            }
+
+
+# Process-wide model pool
+model_holder = ModelHolder()
@@ -7,18 +7,18 @@ class ModelManager:
 
     @staticmethod
     def get_current_version():
-        """Get the currently selected model version from cache"""
+        """Get the currently selected model version from the cache shared by all workers"""
         return cache.get('current_model_version', ModelManager.DEFAULT_VERSION)
 
     @staticmethod
     def set_current_version(version):
-        """Set the current model version in cache"""
-        cache.set('current_model_version', version)
+        """Set the current model version in the shared cache; every worker swaps to it on its next request"""
+        cache.set('current_model_version', version, timeout=None)
 
     @staticmethod
-    def get_model_path():
-        """Get the full path to the current model version."""
-        current_version = ModelManager.get_current_version()
+    def get_model_path(version=None):
+        """Get the full path to the given model version, defaulting to the current one."""
+        current_version = version or ModelManager.get_current_version()
         model_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
             "models", 
@@ -28,8 +28,10 @@ class ModelManager:
 
     @staticmethod
     def get_available_versions():
-        """Get list of available model versions"""
+        """Get list of available model versions, checked out or fetchable from the model repository"""
+        from config.model_sync import model_sync
+
         models_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
         versions = [d for d in os.listdir(models_dir) 
                    if os.path.isdir(os.path.join(models_dir, d)) and d.startswith('trained_model')]
-        return sorted(versions, reverse=True)
\ No newline at end of file
+        return sorted(set(versions) | set(model_sync.known_versions()), reverse=True)
@@ -0,0 +1,300 @@
+# Import necessary modules and classes
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from config.config import MODEL_REPO_PATH, MODEL_REPO_URL, MODEL_SYNC_INTERVAL, MODEL_PINNED_VERSIONS, MODEL_BLOB_CACHE
+from backend.config.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # No cross-process lock outside POSIX; syncs are then only serialised per process
+    fcntl = None
+
+VERSION_PATTERN = re.compile(r"^trained_model_v\d+\.0\.0$")
+LOCK_FILE = ".sync.lock"
+
+
+class ModelSyncError(Exception):
+    """Raised when the model repository cannot be synced"""
+    def __init__(self, command=None, stderr=None):
+        self.command = command
+        self.stderr = stderr
+
+        detailed_msg = f"Model repository sync failed: {' '.join(command) if command else 'unknown command'}"
+        if self.stderr:
+            detailed_msg += f"\nError details: {self.stderr.strip()}"
+
+        super().__init__(detailed_msg)
+
+
+class ModelRepoSync:
+    """Keeps the model versions we serve checked out, fetching them from a background thread.
+
+    The repository is a partial clone (`--filter=blob:none`): a sync fetches
+    only commits and trees, so it is cheap however many versions the remote
+    holds. Only the served version and the pinned ones are checked out, and
+    their blobs (and LFS objects, through the smudge filter) are downloaded
+    then and kept in `git_dir`, which acts as the blob cache: a version that
+    was fetched once can be checked out again without the network. Other
+    versions are materialised on demand by `materialize`.
+
+    Existing versions and locally generated artifacts are never reset or
+    cleaned. A version is checked out into a scratch directory and renamed
+    into place, so `ModelManager` only ever sees complete versions. Every
+    gunicorn worker runs its own sync thread; a lock file lets only one of
+    them sync at a time and the others skip that round.
+    """
+
+    def __init__(self, repo_path=MODEL_REPO_PATH, repo_url=MODEL_REPO_URL, interval=MODEL_SYNC_INTERVAL,
+                 branch="main", git_dir=None, pinned_versions=None):
+        self.repo_path = str(repo_path)
+        self.repo_url = repo_url
+        self.interval = interval
+        self.branch = branch
+        self.git_dir = str(git_dir or os.path.join(self.repo_path, ".git"))
+        self.pinned_versions = list(MODEL_PINNED_VERSIONS if pinned_versions is None else pinned_versions)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.last_sync = None
+        self.last_error = None
+        self.synced_versions = []
+
+    def _git(self, *args, env=None):
+        """Run a git command against the blob cache and return its output."""
+        command = ["git", f"--git-dir={self.git_dir}", *args]
+        result = subprocess.run(
+            command, cwd=self.repo_path, capture_output=True, text=True,
+            env={**os.environ, **env} if env else None
+        )
+        if result.returncode != 0:
+            raise ModelSyncError(command=command, stderr=result.stderr)
+        return result.stdout
+
+    def _ensure_repo(self):
+        """Create the partial clone tracking the remote, without checking anything out."""
+        if not os.path.exists(os.path.join(self.git_dir, "HEAD")):
+            os.makedirs(self.git_dir, exist_ok=True)
+            self._git("init", "--quiet")
+        remotes = self._git("remote").split()
+        if "origin" not in remotes:
+            self._git("remote", "add", "origin", self.repo_url)
+        # Fetch commits and trees only; blobs are downloaded when a version is checked out
+        self._git("config", "remote.origin.promisor", "true")
+        self._git("config", "remote.origin.partialclonefilter", "blob:none")
+
+    @contextmanager
+    def _repo_lock(self, blocking=False):
+        """Hold the cross-process sync lock, yielding False when another process has it."""
+        with self._lock:
+            os.makedirs(self.repo_path, exist_ok=True)
+            if fcntl is None:
+                yield True
+                return
+            lock_path = os.path.join(self.repo_path, LOCK_FILE)
+            with open(lock_path, "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _fetch(self):
+        """Fetch the remote branch without any file contents."""
+        self._ensure_repo()
+        self._git("fetch", "--quiet", "--prune", "--filter=blob:none", "origin", self.branch)
+
+    def remote_versions(self):
+        """Version directories present on the last fetched remote branch."""
+        names = self._git("ls-tree", "-d", "--name-only", f"origin/{self.branch}").split()
+        return sorted(name for name in names if VERSION_PATTERN.match(name))
+
+    def known_versions(self):
+        """Remote versions from the last fetch, without touching the network. Empty before the first sync."""
+        try:
+            return self.remote_versions()
+        except (ModelSyncError, OSError):
+            return []
+
+    def wanted_versions(self):
+        """The served version and the pinned ones."""
+        # Imported here to avoid a circular import, as ModelManager lists our known versions
+        from config.model_manager import ModelManager
+        return list(dict.fromkeys([ModelManager.get_current_version(), *self.pinned_versions]))
+
+    def missing_versions(self):
+        """Wanted remote versions that have no local directory yet."""
+        remote = set(self.remote_versions())
+        return [
+            version for version in self.wanted_versions()
+            if version in remote and not os.path.isdir(os.path.join(self.repo_path, version))
+        ]
+
+    def exclude(self, pattern):
+        """Add `pattern` to the repository's exclude file so local files stay untracked.
+
+        The file is resolved through git, so it is found wherever `git_dir`
+        lives. Returns False before the repository exists.
+        """
+        if not os.path.exists(os.path.join(self.git_dir, "HEAD")):
+            return False
+        exclude_file = os.path.join(self.repo_path, self._git("rev-parse", "--git-path", "info/exclude").strip())
+        os.makedirs(os.path.dirname(exclude_file), exist_ok=True)
+
+        with open(exclude_file, "a+", encoding="utf-8") as f:
+            f.seek(0)
+            if pattern not in f.read().splitlines():
+                f.write(f"{pattern}\n")
+        return True
+
+    def _checkout_version(self, version):
+        """Materialise one version directory atomically, downloading only its blobs."""
+        scratch = tempfile.mkdtemp(prefix=f".{version}.", dir=self.repo_path)
+        try:
+            self._git("--work-tree", scratch, "checkout", f"origin/{self.branch}", "--", version)
+            os.rename(os.path.join(scratch, version), os.path.join(self.repo_path, version))
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def materialize(self, version):
+        """Check out `version` now if it is not local yet, fetching first when it is not known.
+
+        Waits for a sync running in another process. Returns True when the
+        version had to be checked out.
+        """
+        if not VERSION_PATTERN.match(version):
+            raise ModelSyncError(stderr=f"Invalid model version: {version}")
+        if os.path.isdir(os.path.join(self.repo_path, version)):
+            return False
+
+        with self._repo_lock(blocking=True):
+            if os.path.isdir(os.path.join(self.repo_path, version)):
+                return False  # Checked out by another process while we waited
+            if version not in self.known_versions():
+                self._fetch()
+            if version not in self.remote_versions():
+                raise ModelSyncError(stderr=f"Model version {version} is not in {self.repo_url}")
+
+            self._checkout_version(version)
+            self.synced_versions.append(version)
+            logger.info(f"Model version {version} materialised in {self.repo_path}")
+            return True
+
+    def refresh(self):
+        """Fetch the remote now, waiting for a sync running in another process. Returns the remote versions."""
+        with self._repo_lock(blocking=True):
+            self._fetch()
+            return self.remote_versions()
+
+    def publish(self, paths, message, attempts=2):
+        """Commit `paths` (relative to the models directory) on top of the remote branch and push it.
+
+        The commit is built in a temporary index read from the remote tree, so
+        nothing is checked out, no local branch is needed and the partial
+        clone keeps only the versions it already had. When another commit
+        reached the remote first, the branch is fetched again and the commit
+        rebuilt on top of it. Returns the pushed commit.
+        """
+        with self._repo_lock(blocking=True):
+            for attempt in range(attempts):
+                self._fetch()
+                scratch = tempfile.mkdtemp(prefix=".publish.", dir=self.git_dir)
+                env = {"GIT_INDEX_FILE": os.path.join(scratch, "index")}
+                try:
+                    # Reading the remote tree needs no blobs, so nothing is downloaded
+                    self._git("read-tree", f"origin/{self.branch}", env=env)
+                    self._git("--work-tree", self.repo_path, "add", "--", *paths, env=env)
+                    # Unchanged versions are taken from the remote tree as they are, without downloading their blobs
+                    tree = self._git("write-tree", "--missing-ok", env=env).strip()
+                finally:
+                    shutil.rmtree(scratch, ignore_errors=True)
+                commit = self._git("commit-tree", tree, "-p", f"origin/{self.branch}", "-m", message).strip()
+
+                try:
+                    self._git("push", "--quiet", "origin", f"{commit}:refs/heads/{self.branch}")
+                except ModelSyncError:
+                    if attempt + 1 == attempts:
+                        raise
+                    logger.warning("Model repository moved on while publishing, retrying on top of it")
+                    continue
+
+                self._git("update-ref", f"refs/remotes/origin/{self.branch}", commit)
+                logger.info(f"Published {', '.join(paths)} to {self.repo_url} as {commit[:12]}")
+                return commit
+
+    def sync_once(self):
+        """Fetch the remote and check out the wanted versions missing locally. Returns the new versions."""
+        with self._repo_lock() as acquired:
+            if not acquired:
+                logger.info("Model repository sync already running in another process, skipping")
+                return []
+
+            self._fetch()
+            self.exclude(LOCK_FILE)
+
+            added = []
+            for version in self.missing_versions():
+                self._checkout_version(version)
+                added.append(version)
+                logger.info(f"Model version {version} synced to {self.repo_path}")
+
+            self.last_sync = time.time()
+            self.last_error = None
+            self.synced_versions.extend(added)
+            return added
+
+    def _run(self):
+        """Background loop: sync, then wait for the interval or a stop request."""
+        while not self._stop.is_set():
+            try:
+                self.sync_once()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Model repository sync failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background sync thread. Returns False when disabled or already running."""
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-repo-sync", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=None):
+        """Ask the background thread to stop and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        """Return when the repository was last synced and which versions it added."""
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "last_sync": self.last_sync,
+            "last_error": self.last_error,
+            "synced_versions": list(self.synced_versions),
+        }
+
+
+def exclude_from_model_repo(artifact_path, pattern):
+    """Keep generated artifacts next to the model versions out of the model repository."""
+    repo_path = os.path.dirname(os.path.abspath(artifact_path))
+    if repo_path == os.path.abspath(model_sync.repo_path):
+        return model_sync.exclude(pattern)
+    return ModelRepoSync(repo_path, interval=0).exclude(pattern)
+
+
+# Process-wide model repository sync
+model_sync = ModelRepoSync(git_dir=MODEL_BLOB_CACHE)
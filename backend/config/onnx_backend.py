@@ -0,0 +1,129 @@
+# Import necessary modules and classes
+import os
+from types import SimpleNamespace
+import torch
+from config.quantization import is_artifact_fresh
+from config.model_sync import exclude_from_model_repo
+from backend.config.logger import logger
+
+try:
+    import onnxruntime
+except ImportError:  # ONNX Runtime is only needed when INFERENCE_BACKEND=onnx
+    onnxruntime = None
+
+ONNX_INPUTS = ["input_ids", "attention_mask", "token_type_ids"]
+ONNX_OPSET = 17
+ONNX_TOLERANCE = 1e-3  # Maximum absolute logit difference accepted against PyTorch
+VERIFY_TEXTS = ["you are an idiot", "have a nice day, see you tomorrow", "ok"]
+
+
+class OnnxExportError(Exception):
+    """Raised when a model cannot be exported to ONNX or its outputs do not match PyTorch"""
+
+
+class OnnxSequenceClassifier:
+    """ONNX Runtime session exposing the `model(**inputs).logits` interface of the PyTorch model."""
+
+    def __init__(self, artifact_path, intra_op_threads=1, inter_op_threads=1):
+        if onnxruntime is None:
+            raise OnnxExportError("onnxruntime is not installed")
+
+        self.artifact_path = artifact_path
+        self.rebuild(intra_op_threads, inter_op_threads)
+
+    def rebuild(self, intra_op_threads=1, inter_op_threads=1):
+        """Create the session with the given thread pools, replacing one inherited across a fork."""
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        self.session = onnxruntime.InferenceSession(
+            self.artifact_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.threads = (intra_op_threads, inter_op_threads)
+
+    def __call__(self, input_ids=None, attention_mask=None, token_type_ids=None, **kwargs):
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        if token_type_ids is None:
+            token_type_ids = torch.zeros_like(input_ids)
+
+        feeds = {
+            "input_ids": input_ids.numpy().astype("int64"),
+            "attention_mask": attention_mask.numpy().astype("int64"),
+            "token_type_ids": token_type_ids.numpy().astype("int64"),
+        }
+        logits, = self.session.run(["logits"], feeds)
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def eval(self):
+        return self
+
+
+def onnx_artifact_path(model_path):
+    """Path of the ONNX export kept next to a `trained_model_vX.0.0` directory."""
+    return f"{os.path.normpath(model_path)}.onnx"
+
+
+def export_onnx(model, tokenizer, artifact_path):
+    """Export `model` to ONNX with dynamic batch and sequence axes."""
+    # A padded batch makes the exported graph handle attention masks in general
+    inputs = tokenizer(VERIFY_TEXTS[:2], return_tensors="pt", padding=True)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in ONNX_INPUTS}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    tmp_path = f"{artifact_path}.tmp"
+    exclude_from_model_repo(artifact_path, "*.onnx*")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(inputs[name] for name in ONNX_INPUTS),
+            tmp_path,
+            input_names=ONNX_INPUTS,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+            dynamo=False
+        )
+    return tmp_path
+
+
+def verify_onnx(model, session, tokenizer, tolerance=ONNX_TOLERANCE):
+    """Check that the ONNX session reproduces the PyTorch logits within `tolerance`."""
+    inputs = tokenizer(VERIFY_TEXTS, return_tensors="pt", padding=True)
+    with torch.no_grad():
+        expected = model(**inputs).logits
+    actual = session(**inputs).logits
+
+    difference = (expected - actual).abs().max().item()
+    if difference > tolerance:
+        raise OnnxExportError(f"ONNX logits differ from PyTorch by {difference:.6f} (tolerance {tolerance})")
+    return difference
+
+
+def load_onnx(model_path, tokenizer, load_float_model, intra_op_threads=1, inter_op_threads=1):
+    """Return an ONNX Runtime classifier for `model_path`, exporting and verifying it on first use.
+
+    `load_float_model` is only called when no fresh export exists. The
+    session uses the given thread counts, normally this process's share of
+    the CPUs from `config.cpu_layout`.
+    """
+    if onnxruntime is None:
+        raise OnnxExportError("onnxruntime is not installed")
+
+    artifact_path = onnx_artifact_path(model_path)
+    if is_artifact_fresh(artifact_path, model_path):
+        logger.info(f"Loaded ONNX model from: {artifact_path}")
+        return OnnxSequenceClassifier(artifact_path, intra_op_threads, inter_op_threads)
+
+    model = load_float_model()
+    tmp_path = export_onnx(model, tokenizer, artifact_path)
+    try:
+        difference = verify_onnx(model, OnnxSequenceClassifier(tmp_path, intra_op_threads, inter_op_threads), tokenizer)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, artifact_path)
+    logger.info(f"Exported ONNX model to {artifact_path} (max logit difference {difference:.2e})")
+    return OnnxSequenceClassifier(artifact_path, intra_op_threads, inter_op_threads)
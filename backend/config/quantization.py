@@ -0,0 +1,59 @@
+# Import necessary modules and classes
+import os
+import torch
+from config.model_sync import exclude_from_model_repo
+from backend.config.logger import logger
+
+
+def quantized_artifact_path(model_path):
+    """Path of the cached int8 model kept next to a `trained_model_vX.0.0` directory."""
+    return f"{os.path.normpath(model_path)}.int8.pt"
+
+
+def quantize_model(model):
+    """Apply dynamic int8 quantization to the linear layers of `model`."""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def is_artifact_fresh(artifact_path, model_path):
+    """True when the cached artifact exists and is newer than the float weights it was built from."""
+    if not os.path.exists(artifact_path):
+        return False
+    for filename in ("model.safetensors", "pytorch_model.bin"):
+        weights_path = os.path.join(model_path, filename)
+        if os.path.exists(weights_path) and os.path.getmtime(weights_path) > os.path.getmtime(artifact_path):
+            return False
+    return True
+
+
+def load_quantized(model_path, load_float_model):
+    """Return the int8 model for `model_path`, quantizing and caching it on first use.
+
+    `load_float_model` is only called when no fresh cached artifact exists.
+    """
+    artifact_path = quantized_artifact_path(model_path)
+
+    if is_artifact_fresh(artifact_path, model_path):
+        try:
+            # The artifact is produced locally by quantize_model, so the full module is unpickled
+            model = torch.load(artifact_path, weights_only=False)
+            model.eval()
+            logger.info(f"Loaded quantized model from: {artifact_path}")
+            return model
+        except Exception as e:
+            logger.warning(f"Cached quantized model at {artifact_path} is unusable, rebuilding: {e}")
+
+    model = quantize_model(load_float_model())
+    model.eval()
+
+    try:
+        # Write to a temporary file first so a crash never leaves a truncated artifact
+        tmp_path = f"{artifact_path}.tmp"
+        exclude_from_model_repo(artifact_path, "*.int8.pt*")
+        torch.save(model, tmp_path)
+        os.replace(tmp_path, artifact_path)
+        logger.info(f"Saved quantized model to: {artifact_path}")
+    except OSError as e:
+        logger.warning(f"Could not cache quantized model at {artifact_path}: {e}")
+
+    return model
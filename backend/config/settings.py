@@ -1,6 +1,7 @@
 # Import necessary modules and classes
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Adjust BASE_DIR to point to the project root
@@ -70,21 +71,59 @@ TESTING = 'test' in sys.argv
 print(f"Is testing: {TESTING}")
 
 # Database configuration
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.getenv('USER_DB_PATH', BASE_DIR / 'backend' / 'db.sqlite3'),
-    },
-    'admin_db': {
+def sqlite_database(path, env_prefix):
+    """SQLite settings for one database, tuned for concurrent readers and writers.
+
+    WAL journaling lets readers run alongside the single writer, and
+    `synchronous=NORMAL` only syncs at checkpoints, which stays safe with WAL.
+    Writers start with BEGIN IMMEDIATE and wait up to the busy timeout for
+    the lock instead of failing. Connections persist between requests only
+    on WSGI servers (`WEB_SERVER=wsgi`). Every knob can be set per database
+    through `<env_prefix>_*` environment variables.
+    """
+    pragmas = {
+        "journal_mode": os.getenv(f"{env_prefix}_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv(f"{env_prefix}_SYNCHRONOUS", "NORMAL"),
+        "mmap_size": int(os.getenv(f"{env_prefix}_MMAP_SIZE", 128 * 1024 * 1024)),  # Bytes read through mmap
+        "cache_size": int(os.getenv(f"{env_prefix}_CACHE_SIZE", -16384)),  # Negative values are KiB
+    }
+    return {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.getenv('ADMIN_DB_PATH', BASE_DIR / 'backend' / 'admin_db.sqlite3'),
-    },
+        'NAME': os.getenv(f"{env_prefix}_PATH", path),
+        # Keep connections open between requests instead of reconnecting every time. Under ASGI
+        # every request runs its sync code on a new thread, and Django connections are per
+        # thread, so kept connections would never be reused; there they close after each request
+        'CONN_MAX_AGE': int(os.getenv(
+            f"{env_prefix}_CONN_MAX_AGE", 0 if os.getenv("WEB_SERVER", "asgi") == "asgi" else 600
+        )),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': int(os.getenv(f"{env_prefix}_BUSY_TIMEOUT_MS", 5000)) / 1000,
+            'transaction_mode': os.getenv(f"{env_prefix}_TRANSACTION_MODE", "IMMEDIATE"),
+            'init_command': ";".join(f"PRAGMA {name}={value}" for name, value in pragmas.items()),
+        },
+    }
+
+
+DATABASES = {
+    'default': sqlite_database(BASE_DIR / 'backend' / 'db.sqlite3', 'USER_DB'),
+    'admin_db': sqlite_database(BASE_DIR / 'backend' / 'admin_db.sqlite3', 'ADMIN_DB'),
 }
 
 
 DATABASE_ROUTERS = ['CSA_AdminApp.db_router.AdminDbRouter']
 
 
+# Cache shared by every worker process, which holds the selected model version
+# (a per-process memory cache would switch only the worker handling the change)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tempfile.mkdtemp(prefix='csa-cache-') if TESTING else os.getenv('CACHE_DIR', BASE_DIR / 'backend' / 'cache'),
+    }
+}
+
+
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
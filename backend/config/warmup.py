@@ -0,0 +1,45 @@
+# Import necessary modules and classes
+import threading
+from config.model_manager import ModelManager
+from config.model_holder import model_holder
+from config.model_sync import model_sync
+from backend.config.logger import logger
+
+_lock = threading.Lock()
+_thread = None
+
+
+def warm_up_serving(sync_repo=True):
+    """Load the active model and run a warm-up inference.
+
+    Nothing is loaded at import time; this is called by the gunicorn master
+    before forking, by the `warm_up` management command, or in the
+    background by the readiness probe. With `sync_repo` the model repository
+    sync is started in the background; startup only waits on the remote when
+    the served version is not checked out at all.
+    Returns True once the process is ready.
+    """
+    if sync_repo:
+        model_sync.start()
+
+    try:
+        # Only the served version is fetched if it is not checked out yet
+        model_sync.materialize(ModelManager.get_current_version())
+        model_path = ModelManager.get_model_path()
+        logger.info(f"Resolved model path: {model_path}")
+        model_holder.get_active(model_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error loading model: {e}")
+        return False
+
+
+def start_warm_up():
+    """Run `warm_up_serving` in a background thread unless one is already running."""
+    global _thread
+    with _lock:
+        if model_holder.is_ready() or (_thread is not None and _thread.is_alive()):
+            return False
+        _thread = threading.Thread(target=warm_up_serving, name="model-warm-up", daemon=True)
+        _thread.start()
+        return True
@@ -0,0 +1,94 @@
+# Import necessary modules and classes
+import gc
+import os
+
+# Production server configuration: gunicorn -c gunicorn.conf.py
+#
+# The app and the active model are loaded once in the master process, and the
+# workers are forked from it. The model weights are memory-mapped from
+# model.safetensors and everything else loaded before the fork is shared
+# copy-on-write, so adding workers costs little memory.
+#
+# By default the workers are uvicorn's ASGI workers serving config.asgi, so
+# the async views run on an event loop and inference runs on the bounded
+# inference executor. WEB_SERVER=wsgi switches back to threaded sync workers.
+
+# Make `backend.*` importable, as manage.py does
+pythonpath = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# ASGI (uvicorn event loop per worker) or WSGI (request threads per worker)
+server_mode = os.getenv("WEB_SERVER", "asgi")
+if server_mode == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "config.wsgi:application"
+    worker_class = "gthread"
+
+# Worker processes and request threads per worker (threads only apply to WSGI workers)
+workers = int(os.getenv("WEB_WORKERS", 2))
+threads = int(os.getenv("WEB_THREADS", 4))
+timeout = int(os.getenv("WEB_TIMEOUT", 120))
+preload_app = True
+
+
+def thread_layout():
+    """Split the container's CPUs across the workers and the inferences each runs at once."""
+    from config.config import BATCHING_ENABLED, HIGHLIGHT_MODE, TORCH_THREADS, ASYNC_INFERENCE_WORKERS
+    from config.cpu_layout import plan_threads
+
+    # The inference executor (ASGI) or the request threads (WSGI) run the passes side by side
+    request_concurrency = ASYNC_INFERENCE_WORKERS if server_mode == "asgi" else threads
+    if not BATCHING_ENABLED:
+        concurrent = request_concurrency
+    elif HIGHLIGHT_MODE == "attribution":
+        # Attribution needs gradients, so its passes run on those threads next to the batcher thread
+        concurrent = request_concurrency + 1
+    else:
+        # One batcher thread per worker runs every forward pass
+        concurrent = 1
+    return plan_threads(workers, concurrent, TORCH_THREADS)
+
+
+def when_ready(server):
+    """Load and warm up the active model in the master, before any worker is forked."""
+    import torch
+    from django.urls import get_resolver
+    from config.model_holder import model_holder
+    from config.warmup import warm_up_serving
+    from config.cpu_layout import describe_layout
+
+    # Keep the master single-threaded so no intra-op thread pool (torch or ONNX Runtime) exists at fork time
+    torch.set_num_threads(1)
+    # Import the views here too, so the workers inherit them instead of importing on their first request
+    get_resolver().urlconf_module
+    # The repository is synced by the workers, so the master stays single-threaded
+    warm_up_serving(sync_repo=False)
+    server.log.info(f"Preloaded model {model_holder.stats()['active']} for {workers} workers")
+    server.log.info(f"Worker thread layout: {describe_layout(thread_layout())}")
+
+    # Objects created so far are never collected, so the workers' garbage
+    # collector does not write to (and un-share) their pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Give each worker its share of the CPUs and start its model repository sync."""
+    from config.cpu_layout import apply_thread_layout
+    from config.model_holder import model_holder
+    from config.model_sync import model_sync
+
+    apply_thread_layout(thread_layout())
+    # ONNX Runtime sessions built in the master get fresh thread pools sized for this worker
+    model_holder.after_fork()
+    # Threads do not survive the fork; the workers share one sync lock, so only one fetches at a time
+    model_sync.start()
+
+
+def worker_exit(server, worker):
+    """Store the analyses still waiting in the worker's write-behind buffer."""
+    from app.write_buffer import analysis_writes
+
+    analysis_writes.stop()
@@ -0,0 +1,61 @@
+# Import necessary modules and classes
+import os
+import tempfile
+from unittest.mock import patch
+import torch
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+from config.model_holder import ModelHolder
+
+# Small vocabulary used by the tiny test model
+VOCAB = [
+    "[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+    "you", "are", "an", "idiot", "stupid", "nice", "day", "have", "a", "the",
+    "i", "will", "hate", "love", "this", "is", "test", "##s", "##ing",
+    ",", ".", "!", "?",
+]
+
+def build_tiny_model(output_dir, seed=0):
+    """Save a tiny randomly initialised BERT classifier and its tokenizer to `output_dir`."""
+    os.makedirs(output_dir, exist_ok=True)
+    vocab_file = os.path.join(output_dir, "vocab.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(VOCAB) + "\n")
+
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=len(VOCAB),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=37,
+        num_labels=6,
+        problem_type="multi_label_classification",
+    )
+    model = BertForSequenceClassification(config)
+    model.eval()
+    tokenizer = BertTokenizerFast(vocab_file)
+
+    model.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    return model, tokenizer
+
+
+class TinyModelViewMixin:
+    """Serve the analysis views from a freshly built tiny model and an empty model holder.
+
+    Test cases add their own patches of `app.views` by overriding `view_patches`.
+    """
+
+    def view_patches(self):
+        return ()
+
+    def setUp(self):
+        super().setUp()
+        model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(model_dir.cleanup)
+        build_tiny_model(model_dir.name)
+        for patcher in (patch('app.views.ModelManager.get_model_path', return_value=model_dir.name),
+                        patch('app.views.model_holder', ModelHolder()),
+                        *self.view_patches()):
+            patcher.start()
+            self.addCleanup(patcher.stop)
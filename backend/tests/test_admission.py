@@ -0,0 +1,134 @@
+# Import necessary modules and classes
+import threading
+import time
+from unittest.mock import patch
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from app.admission import AdmissionController, AdmissionRejected
+from app.result_cache import SingleFlight, result_cache
+from app.views import get_analysis
+from tests.fixtures import TinyModelViewMixin
+
+# Tests for admission control and load shedding
+class AdmissionControllerTest(SimpleTestCase):
+    def hold(self, controller, release):
+        """Keep one request inside the controller until `release` is set."""
+        entered = threading.Event()
+
+        def run():
+            with controller.admit():
+                entered.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        entered.wait(5)
+        return thread
+
+    def test_rejects_when_queue_is_full(self):
+        """Requests beyond the queue size are rejected immediately."""
+        controller = AdmissionController(max_queue_size=1, default_deadline_ms=10000)
+        release = threading.Event()
+        thread = self.hold(controller, release)
+
+        with self.assertRaises(AdmissionRejected) as raised:
+            with controller.admit():
+                pass
+        self.assertEqual(raised.exception.reason, "queue full")
+        self.assertGreaterEqual(raised.exception.retry_after, 1)
+
+        release.set()
+        thread.join()
+        stats = controller.stats()
+        self.assertEqual((stats["depth"], stats["admitted"], stats["rejected_queue_full"]), (0, 1, 1))
+
+    def test_rejects_requests_that_would_miss_their_deadline(self):
+        """Once the service time is known, a busy system sheds requests with too short a deadline."""
+        controller = AdmissionController(max_queue_size=10, default_deadline_ms=10000)
+        with controller.admit():
+            time.sleep(0.05)
+        self.assertGreater(controller.stats()["service_time_ms"], 40)
+
+        release = threading.Event()
+        thread = self.hold(controller, release)
+        with self.assertRaises(AdmissionRejected) as raised:
+            with controller.admit(controller.deadline(10)):
+                pass
+        self.assertEqual(raised.exception.reason, "deadline")
+
+        # A generous deadline is still admitted
+        with controller.admit(controller.deadline(10000)):
+            pass
+        release.set()
+        thread.join()
+        self.assertEqual(controller.stats()["rejected_deadline"], 1)
+
+    def test_idle_system_always_admits(self):
+        """A stale slow estimate never blocks requests when nothing is queued."""
+        controller = AdmissionController(max_queue_size=10, default_deadline_ms=10000)
+        with controller.admit():
+            time.sleep(0.05)
+        with controller.admit(controller.deadline(1)):
+            pass
+        self.assertEqual(controller.stats()["admitted"], 2)
+
+# Tests for shedding load in the analyze view
+class AnalyzeTextAdmissionViewTests(TinyModelViewMixin, TestCase):
+    def view_patches(self):
+        return (patch('app.views.admission', AdmissionController(max_queue_size=0)),)
+
+    def setUp(self):
+        super().setUp()
+        result_cache.clear()
+
+    def test_overloaded_request_gets_429(self):
+        """A rejected request answers 429 with Retry-After and is counted in the stats."""
+        response = self.client.post(reverse('analyze_text'), {'text': 'you are an idiot'}, HTTP_X_DEADLINE_MS='500')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(self.client.get(reverse('inference_stats')).json()['admission']['rejected_queue_full'], 1)
+
+# Tests for admitting only the single-flight leader of identical requests
+class CoalescedAdmissionTests(TinyModelViewMixin, SimpleTestCase):
+    def view_patches(self):
+        self.admission = AdmissionController(max_queue_size=2, default_deadline_ms=10000)
+        self.flight = SingleFlight()
+        return (patch('app.views.admission', self.admission),
+                patch('app.views.in_flight', self.flight),
+                patch('app.views.RESULT_CACHE_ENABLED', False))
+
+    def test_identical_concurrent_requests_share_one_admission(self):
+        """A burst of identical texts larger than the queue is served by one admitted inference."""
+        count = 20
+        release = threading.Event()
+
+        def slow_analysis(*args):
+            release.wait(5)
+            return "result"
+
+        results, errors = [], []
+
+        def request():
+            try:
+                results.append(get_analysis("you are an idiot"))
+            except AdmissionRejected as e:
+                errors.append(e)
+
+        with patch('app.views.run_analysis', side_effect=slow_analysis) as run:
+            threads = [threading.Thread(target=request) for _ in range(count)]
+            for thread in threads:
+                thread.start()
+            waited = time.monotonic() + 5
+            while self.flight.stats()["coalesced"] + len(errors) < count - 1 and time.monotonic() < waited:
+                time.sleep(0.01)
+            # Followers wait on the leader without occupying the queue
+            self.assertEqual(self.admission.stats()["depth"], 1)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, ["result"] * count)
+        self.assertEqual(run.call_count, 1)
+        stats = self.admission.stats()
+        self.assertEqual((stats["admitted"], stats["rejected_queue_full"], stats["rejected_deadline"]), (1, 0, 0))
@@ -0,0 +1,58 @@
+# Import necessary modules and classes
+import asyncio
+import threading
+from unittest.mock import patch
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from app.batching import InferenceExecutor, InferenceQueueFull
+from app.models import TextAnalysis
+from tests.fixtures import TinyModelViewMixin
+
+# Tests for the async analyze view
+class AnalyzeTextAsyncViewTests(TinyModelViewMixin, TestCase):
+    def view_patches(self):
+        return (patch('app.views.WRITE_BEHIND_ENABLED', False),)
+
+    async def test_async_view_matches_sync_view(self):
+        """The async endpoint returns the same analysis as the sync one and stores it."""
+        response = await self.async_client.post(reverse('analyze_text_async'), {'text': 'you are an idiot'})
+        data = response.json()
+        self.assertTrue(data['success'])
+
+        sync_data = (await sync_to_async(self.client.post)(reverse('analyze_text'), {'text': 'you are an idiot'})).json()
+        self.assertEqual(data['results'], sync_data['results'])
+        self.assertEqual(data['flagged_words'], sync_data['flagged_words'])
+        self.assertEqual(await TextAnalysis.objects.acount(), 2)
+        self.assertEqual((await TextAnalysis.objects.aget(id=data['id'])).text, 'you are an idiot')
+
+    async def test_async_view_rejects_empty_text(self):
+        """Empty texts are rejected before any inference is scheduled."""
+        response = await self.async_client.post(reverse('analyze_text_async'), {'text': '  '})
+        self.assertEqual(response.json(), {"error": "No text provided"})
+
+    async def test_async_view_returns_503_when_executor_is_full(self):
+        """A full executor answers 503 with Retry-After like the sync queue."""
+        with patch('app.views.inference_executor.run', side_effect=InferenceQueueFull("full")):
+            response = await self.async_client.post(reverse('analyze_text_async'), {'text': 'you are an idiot'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+# Tests for the bounded inference executor
+class InferenceExecutorTest(SimpleTestCase):
+    def test_runs_off_the_event_loop_and_bounds_pending_calls(self):
+        """Calls run on pool threads, and calls beyond the limit are rejected."""
+        executor = InferenceExecutor(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        async def scenario():
+            first = asyncio.ensure_future(executor.run(lambda: release.wait(5) and threading.current_thread().name))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(InferenceQueueFull):
+                await executor.run(lambda: None)
+            release.set()
+            return await first
+
+        thread_name = asyncio.run(scenario())
+        self.assertTrue(thread_name.startswith("inference"))
+        self.assertEqual(executor.stats(), {"pending": 0, "max_pending": 1, "rejected": 1})
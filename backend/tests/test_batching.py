@@ -0,0 +1,90 @@
+# Import necessary modules and classes
+import tempfile
+import threading
+import torch
+from django.test import SimpleTestCase
+from app.batching import InferenceBatcher, InferenceQueueFull
+from app.inference import predict_probabilities
+from tests.fixtures import build_tiny_model
+
+# Tests for the cross-request micro-batching scheduler
+class InferenceBatcherTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.model, self.tokenizer = build_tiny_model(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_concurrent_requests_share_forward_passes(self):
+        """Requests arriving within the window are scored together and get their own rows back."""
+        batcher = InferenceBatcher(max_batch_size=32, max_wait_ms=200, max_queue_size=16)
+        calls = []
+        original_forward = self.model.forward
+        self.model.forward = lambda *a, **kw: calls.append(1) or original_forward(*a, **kw)
+
+        texts = [["you are an idiot"], ["have a nice day", "i love this"], ["stupid"]]
+        results = [None] * len(texts)
+
+        def run(index):
+            results[index] = batcher.predict(self.model, self.tokenizer, texts[index])
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(texts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLess(len(calls), len(texts))
+        self.model.forward = original_forward
+        for request_texts, probabilities in zip(texts, results):
+            expected = predict_probabilities(self.model, self.tokenizer, request_texts)
+            self.assertTrue(torch.allclose(probabilities, expected, atol=1e-5))
+
+    def test_full_queue_rejects_requests(self):
+        """Submitting beyond the queue capacity fails fast instead of waiting."""
+        batcher = InferenceBatcher(max_batch_size=1, max_wait_ms=0, max_queue_size=1)
+        batcher._ensure_worker = lambda: None  # keep the worker from draining the queue
+        batcher.submit(self.model, self.tokenizer, ["you"])
+        with self.assertRaises(InferenceQueueFull):
+            batcher.submit(self.model, self.tokenizer, ["are"])
+
+    def test_window_settings_are_applied_per_request(self):
+        """Requests with different long-text settings are scored with their own settings."""
+        batcher = InferenceBatcher(max_batch_size=32, max_wait_ms=50, max_queue_size=16)
+        text = " ".join(["you are an idiot have a nice day"] * 4)
+        window = {"max_length": 12, "stride": 4}
+
+        windowed = batcher.submit(self.model, self.tokenizer, [text], window)
+        truncated = batcher.submit(self.model, self.tokenizer, [text])
+
+        self.assertTrue(torch.allclose(
+            windowed.result(), predict_probabilities(self.model, self.tokenizer, [text], **window), atol=1e-5
+        ))
+        self.assertTrue(torch.allclose(
+            truncated.result(), predict_probabilities(self.model, self.tokenizer, [text]), atol=1e-5
+        ))
+
+    def test_failures_do_not_stop_the_worker(self):
+        """A cancelled request or one whose rows cannot be handed back fails alone and the worker keeps serving."""
+        batcher = InferenceBatcher(max_batch_size=32, max_wait_ms=200, max_queue_size=16)
+        # Submit while the worker is held back, so all three land in one batch
+        batcher._ensure_worker = lambda: None
+        cancelled = batcher.submit(self.model, self.tokenizer, ["you are an idiot"])
+        empty = batcher.submit(self.model, self.tokenizer, [])
+        served = batcher.submit(self.model, self.tokenizer, ["have a nice day"])
+        self.assertTrue(cancelled.cancel())
+        del batcher._ensure_worker
+        batcher._ensure_worker()
+
+        with self.assertRaises(RuntimeError):
+            empty.result(timeout=5)
+        expected = predict_probabilities(self.model, self.tokenizer, ["have a nice day"])
+        self.assertTrue(torch.allclose(served.result(timeout=5), expected, atol=1e-5))
+
+        # The same worker thread is still alive and serves later requests
+        worker = batcher._worker
+        later = batcher.submit(self.model, self.tokenizer, ["ok"])
+        self.assertEqual(later.result(timeout=5).shape, (1, 6))
+        self.assertIs(batcher._worker, worker)
+        self.assertTrue(worker.is_alive())
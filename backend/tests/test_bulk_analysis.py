@@ -0,0 +1,107 @@
+# Import necessary modules and classes
+import json
+from unittest.mock import patch
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from app.models import TextAnalysis
+from app.batching import InferenceQueueFull
+from tests.fixtures import TinyModelViewMixin
+
+# Tests for the bulk analysis endpoint
+class AnalyzeBulkViewTests(TinyModelViewMixin, TestCase):
+    def view_patches(self):
+        return (patch('app.views.WRITE_BEHIND_ENABLED', False), patch('app.views.BULK_CHUNK_SIZE', 2))
+
+    def post(self, body, content_type="application/json", query=""):
+        response = self.client.post(reverse('analyze_bulk') + query, body, content_type=content_type)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        content = b"".join(response.streaming_content).decode("utf-8")
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_json_array_matches_single_analysis(self):
+        """Every text gets the same analysis as the single-text endpoint, in input order."""
+        texts = ["you are an idiot", "have a nice day", "i hate this test", "stupid"]
+        records = self.post(json.dumps(texts))
+
+        self.assertEqual([record["index"] for record in records], list(range(len(texts))))
+        self.assertEqual(TextAnalysis.objects.count(), len(texts))
+        for text, record in zip(texts, records):
+            single = self.client.post(reverse('analyze_text'), {'text': text}).json()
+            self.assertEqual(record["flagged_words"], single["flagged_words"])
+            self.assertEqual(record["highlighted_text"], single["highlighted_text"])
+            for label, result in single["results"].items():
+                self.assertAlmostEqual(record["results"][label]["probability"], result["probability"], places=5)
+            self.assertEqual(TextAnalysis.objects.get(id=record["id"]).text, text)
+
+    def test_ndjson_without_highlighting_or_saving(self):
+        """NDJSON objects are accepted, invalid lines are reported in place."""
+        body = '{"text": "you are an idiot"}\n\nnot json\n"have a nice day"\n{"text": "  "}\n'
+        records = self.post(body, "application/x-ndjson", "?highlight=0&save=0")
+
+        self.assertEqual(len(records), 4)
+        self.assertTrue(records[0]["success"])
+        self.assertNotIn("flagged_words", records[0])
+        self.assertIsNone(records[0]["id"])
+        self.assertIn("Invalid JSON line", records[1]["error"])
+        self.assertTrue(records[2]["success"])
+        self.assertEqual(records[3]["error"], "No text provided")
+        self.assertEqual(TextAnalysis.objects.count(), 0)
+
+    def test_busy_chunk_is_reported_per_item(self):
+        """A chunk rejected by the inference queue reports an error for each of its texts."""
+        with patch('app.views.batcher.predict', side_effect=InferenceQueueFull("full")):
+            records = self.post(json.dumps(["you are an idiot", "stupid", "have a nice day"]))
+        self.assertEqual([record["error"] for record in records], ["Server is busy, please retry shortly"] * 3)
+
+    def test_bodies_over_the_upload_limit_are_read_from_the_stream(self):
+        """Bulk bodies larger than Django's 2.5 MB upload limit are accepted up to BULK_MAX_BODY_MB."""
+        text = "you are an idiot " * 1800
+        ndjson = "".join(json.dumps({"text": text}) + "\n" for _ in range(100))
+        self.assertGreater(len(ndjson), settings.DATA_UPLOAD_MAX_MEMORY_SIZE)
+        records = self.post(ndjson, "application/x-ndjson", "?highlight=0&save=0")
+        self.assertEqual(len(records), 100)
+        self.assertTrue(all(record["success"] for record in records))
+
+        records = self.post(json.dumps([text] * 100), query="?highlight=0&save=0")
+        self.assertEqual(len(records), 100)
+
+        with patch('app.views.BULK_MAX_BODY_MB', 1):
+            response = self.client.post(reverse('analyze_bulk'), ndjson, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 413)
+
+    def test_rejects_malformed_requests(self):
+        """The body must be a JSON array and within the size limit."""
+        self.assertEqual(self.client.post(reverse('analyze_bulk'), '{"text": "x"}',
+                                          content_type="application/json").status_code, 400)
+        with patch('app.views.BULK_MAX_TEXTS', 1):
+            self.assertEqual(self.client.post(reverse('analyze_bulk'), '["a", "b"]',
+                                              content_type="application/json").status_code, 400)
+        self.assertEqual(self.client.get(reverse('analyze_bulk')).status_code, 405)
+
+    async def test_asgi_streams_each_chunk_as_it_finishes(self):
+        """Under ASGI every chunk is sent before the next one is analysed, instead of after the whole request."""
+        from app import views
+        events = []
+        analyze_chunk = views.analyze_bulk_chunk
+
+        def recording_chunk(chunk, highlight=True):
+            events.append("analyzed")
+            return analyze_chunk(chunk, highlight)
+
+        texts = ["you are an idiot", "have a nice day", "i hate this test", "stupid", "nice"]
+        with patch('app.views.analyze_bulk_chunk', side_effect=recording_chunk):
+            response = await self.async_client.post(reverse('analyze_bulk'), json.dumps(texts),
+                                                     content_type="application/json")
+            self.assertTrue(response.is_async)
+            lines = []
+            async for chunk in response.streaming_content:
+                events.append("sent")
+                lines.extend(chunk.decode("utf-8").splitlines())
+
+        self.assertEqual(events, ["analyzed", "sent"] * 3)
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record["index"] for record in records], list(range(len(texts))))
+        self.assertEqual(await TextAnalysis.objects.acount(), len(texts))
+        self.assertEqual(sorted(record["id"] for record in records),
+                         [row.id async for row in TextAnalysis.objects.order_by("id")])
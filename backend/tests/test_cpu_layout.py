@@ -0,0 +1,98 @@
+# Import necessary modules and classes
+import os
+import runpy
+import tempfile
+from unittest.mock import patch
+import torch
+from django.test import SimpleTestCase
+from config.cpu_layout import cgroup_cpu_quota, available_cpus, plan_threads, apply_thread_layout
+
+# Tests for the CPU quota detection and thread partitioning
+class CpuLayoutTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, relative_path, content):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_cgroup_v2_quota(self):
+        """cpu.max gives the quota in cores, "max" means unlimited."""
+        self.write("cpu.max", "150000 100000\n")
+        self.assertEqual(cgroup_cpu_quota(self.root), 1.5)
+        self.write("cpu.max", "max 100000\n")
+        self.assertIsNone(cgroup_cpu_quota(self.root))
+
+    def test_cgroup_v1_quota(self):
+        """The CFS quota and period give the limit, -1 means unlimited."""
+        self.write("cpu/cpu.cfs_quota_us", "400000\n")
+        self.write("cpu/cpu.cfs_period_us", "100000\n")
+        self.assertEqual(cgroup_cpu_quota(self.root), 4.0)
+        self.write("cpu/cpu.cfs_quota_us", "-1\n")
+        self.assertIsNone(cgroup_cpu_quota(self.root))
+
+    def test_no_cgroup_uses_affinity(self):
+        """Without a cgroup limit every CPU in the affinity mask is used."""
+        with patch('config.cpu_layout.affinity_cpus', return_value=6):
+            self.assertEqual(available_cpus(self.root), 6)
+
+    @patch('config.cpu_layout.affinity_cpus', return_value=16)
+    def test_quota_is_split_across_workers(self, _):
+        """The quota caps the CPU count and every concurrent inference gets an equal share."""
+        self.write("cpu.max", "450000 100000\n")
+        layout = plan_threads(workers=2, cgroup_root=self.root)
+        self.assertEqual((layout["cpus"], layout["intra_op_threads"], layout["inter_op_threads"]), (4, 2, 1))
+
+        # More concurrent inferences than CPUs still leaves one thread each
+        self.assertEqual(plan_threads(workers=2, concurrent_per_worker=4, cgroup_root=self.root)["intra_op_threads"], 1)
+        # A fractional quota below one CPU still allows one thread
+        self.write("cpu.max", "50000 100000\n")
+        self.assertEqual(plan_threads(cgroup_root=self.root)["cpus"], 1)
+        # An explicit thread count wins
+        self.assertEqual(plan_threads(workers=2, intra_op_threads=3, cgroup_root=self.root)["intra_op_threads"], 3)
+
+    def test_apply_sets_torch_threads(self):
+        """Applying a layout pins the torch intra-op thread count."""
+        previous = torch.get_num_threads()
+        self.addCleanup(torch.set_num_threads, previous)
+        apply_thread_layout(plan_threads(intra_op_threads=2, cgroup_root=self.root))
+        self.assertEqual(torch.get_num_threads(), 2)
+
+# Tests for the server mode and thread layout chosen by gunicorn.conf.py
+class GunicornConfigTest(SimpleTestCase):
+    CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+
+    def load(self, **env):
+        with patch.dict(os.environ, env):
+            return runpy.run_path(self.CONFIG_PATH)
+
+    def test_asgi_workers_by_default(self):
+        """The default deployment serves config.asgi on uvicorn workers, sized by the inference executor."""
+        settings = self.load()
+        self.assertEqual(settings["wsgi_app"], "config.asgi:application")
+        self.assertEqual(settings["worker_class"], "uvicorn_worker.UvicornWorker")
+        with patch('config.config.BATCHING_ENABLED', False), patch('config.config.ASYNC_INFERENCE_WORKERS', 3):
+            self.assertEqual(settings["thread_layout"]()["concurrent_per_worker"], 3)
+
+    def test_wsgi_workers_on_request(self):
+        """WEB_SERVER=wsgi keeps threaded sync workers, sized by their request threads."""
+        settings = self.load(WEB_SERVER="wsgi", WEB_THREADS="5")
+        self.assertEqual(settings["wsgi_app"], "config.wsgi:application")
+        self.assertEqual(settings["worker_class"], "gthread")
+        with patch('config.config.BATCHING_ENABLED', False):
+            self.assertEqual(settings["thread_layout"]()["concurrent_per_worker"], 5)
+
+    def test_attribution_passes_counted_beside_the_batcher(self):
+        """With attribution highlighting, the executor's gradient passes run alongside the batcher thread."""
+        settings = self.load()
+        with patch('config.config.BATCHING_ENABLED', True), patch('config.config.ASYNC_INFERENCE_WORKERS', 3):
+            with patch('config.config.HIGHLIGHT_MODE', "words"):
+                self.assertEqual(settings["thread_layout"]()["concurrent_per_worker"], 1)
+            with patch('config.config.HIGHLIGHT_MODE', "attribution"):
+                self.assertEqual(settings["thread_layout"]()["concurrent_per_worker"], 4)
@@ -0,0 +1,54 @@
+# Import necessary modules and classes
+import os
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase
+from config.settings import sqlite_database
+
+
+# Tests for the SQLite connection tuning of both databases
+class SqliteTuningTests(TestCase):
+    databases = {'default', 'admin_db'}
+
+    def pragma(self, alias, name):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        """Every connection of both databases gets the configured pragmas and busy timeout."""
+        for alias in ('default', 'admin_db'):
+            self.assertEqual(self.pragma(alias, "synchronous"), 1)  # NORMAL
+            self.assertEqual(self.pragma(alias, "busy_timeout"), 5000)
+            self.assertEqual(self.pragma(alias, "cache_size"), -16384)
+            self.assertEqual(connections[alias].transaction_mode, "IMMEDIATE")
+
+    def test_settings_per_database(self):
+        """Each database reads its own environment knobs."""
+        with patch.dict(os.environ, {"ADMIN_DB_JOURNAL_MODE": "DELETE", "ADMIN_DB_CONN_MAX_AGE": "0",
+                                     "ADMIN_DB_BUSY_TIMEOUT_MS": "250"}):
+            admin = sqlite_database("admin.sqlite3", "ADMIN_DB")
+            user = sqlite_database("user.sqlite3", "USER_DB")
+
+        self.assertIn("PRAGMA journal_mode=DELETE", admin["OPTIONS"]["init_command"])
+        self.assertEqual(admin["CONN_MAX_AGE"], 0)
+        self.assertEqual(admin["OPTIONS"]["timeout"], 0.25)
+        self.assertIn("PRAGMA journal_mode=WAL", user["OPTIONS"]["init_command"])
+
+    def test_persistent_connections_only_on_wsgi(self):
+        """Connections are kept between requests on WSGI workers, and closed per request under ASGI."""
+        with patch.dict(os.environ, {"WEB_SERVER": "wsgi"}):
+            self.assertEqual(sqlite_database("user.sqlite3", "USER_DB")["CONN_MAX_AGE"], 600)
+        with patch.dict(os.environ, {"WEB_SERVER": "asgi"}):
+            self.assertEqual(sqlite_database("user.sqlite3", "USER_DB")["CONN_MAX_AGE"], 0)
+        with patch.dict(os.environ, {"WEB_SERVER": "asgi", "USER_DB_CONN_MAX_AGE": "60"}):
+            self.assertEqual(sqlite_database("user.sqlite3", "USER_DB")["CONN_MAX_AGE"], 60)
+
+    def test_benchmark_command(self):
+        """The benchmark compares SQLite's defaults with the configured WAL setup."""
+        out = StringIO()
+        call_command("benchmark_db", seconds=0.2, rows=10, writers=1, readers=1, stdout=out)
+        self.assertIn("journal_mode=delete", out.getvalue())
+        self.assertIn("journal_mode=wal", out.getvalue())
@@ -0,0 +1,124 @@
+# Import necessary modules and classes
+import tempfile
+import torch
+from unittest.mock import patch
+from django.test import SimpleTestCase
+from app.inference import (
+    LABELS, predict_probabilities, build_results, flag_words, highlight_words, attribute_words, analyze,
+    window_settings, LONG_TEXT_WINDOW, LONG_TEXT_TRUNCATE
+)
+from tests.fixtures import build_tiny_model
+
+# Tests for the batched inference helpers
+class InferenceHelpersTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.model, self.tokenizer = build_tiny_model(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_batched_probabilities_match_single_passes(self):
+        """Padded batch scoring gives the same probabilities as one pass per text."""
+        texts = ["you", "are an idiot", "have a nice day !"]
+        batched = predict_probabilities(self.model, self.tokenizer, texts)
+        self.assertEqual(tuple(batched.shape), (3, len(LABELS)))
+        for row, text in zip(batched, texts):
+            single = predict_probabilities(self.model, self.tokenizer, [text])[0]
+            self.assertTrue(torch.allclose(row, single, atol=1e-5))
+
+    def test_flag_words_scores_words_in_one_pass(self):
+        """All words are scored in a single forward pass and stay aligned with the input."""
+        words = "you are an idiot you".split()
+        with torch.no_grad():
+            calls = []
+            original_forward = self.model.forward
+            self.model.forward = lambda *a, **kw: calls.append(1) or original_forward(*a, **kw)
+            flags = flag_words(lambda texts: predict_probabilities(self.model, self.tokenizer, texts), words)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(flags), len(words))
+        self.assertEqual(flags[0], flags[4])
+
+    def test_highlight_words(self):
+        """Flagged words are listed and wrapped in highlight markup."""
+        flags = [[False] * len(LABELS), [True] + [False] * (len(LABELS) - 1)]
+        word_results, highlighted = highlight_words(["hello", "idiot"], flags)
+        self.assertEqual(word_results, [{"word": "idiot", "toxic": True, "severe_toxic": False,
+                                         "obscene": False, "threat": False, "insult": False,
+                                         "identity_hate": False}])
+        self.assertEqual(highlighted, 'hello <span class="text-red-600 font-bold">idiot</span>')
+
+    def test_build_results(self):
+        """Probabilities are thresholded per label."""
+        results = build_results(torch.tensor([0.9, 0.1, 0.2, 0.3, 0.6, 0.0]))
+        self.assertTrue(results["toxic"]["toxic"])
+        self.assertFalse(results["severe_toxic"]["toxic"])
+        self.assertTrue(results["insult"]["toxic"])
+        self.assertAlmostEqual(results["toxic"]["probability"], 0.9, places=5)
+
+    def test_attribution_matches_full_text_classification(self):
+        """Attribution mode classifies the text exactly like the plain full-text pass."""
+        text = "you are an idiot , have a nice day"
+        probabilities, word_flags = attribute_words(self.model, self.tokenizer, text.split())
+        expected = predict_probabilities(self.model, self.tokenizer, [text])[0]
+        self.assertTrue(torch.allclose(probabilities, expected, atol=1e-5))
+        self.assertEqual(len(word_flags), len(text.split()))
+
+    @patch('app.inference.THRESHOLD', 0.0)
+    def test_attribution_flags_words_for_flagged_labels(self):
+        """Labels flagged on the text are attributed back to some of its words."""
+        results, word_results, highlighted = analyze(self.model, self.tokenizer, "you are an idiot", "attribution")
+        self.assertTrue(all(result["toxic"] for result in results.values()))
+        self.assertGreater(len(word_results), 0)
+        self.assertIn('<span class="text-red-600 font-bold">', highlighted)
+
+    @patch('app.inference.THRESHOLD', 1.0)
+    def test_attribution_clean_text_flags_nothing(self):
+        """A text with no flagged label has no flagged words."""
+        results, word_results, highlighted = analyze(self.model, self.tokenizer, "you are an idiot", "attribution")
+        self.assertEqual(word_results, [])
+        self.assertEqual(highlighted, "you are an idiot")
+
+    def test_attribution_aligns_pieces_with_words(self):
+        """Words split into several pieces or glued to punctuation still map to one word each."""
+        words = ["tests", "idiot!", "you,", "love", "zzz"]
+        probabilities, word_flags = attribute_words(self.model, self.tokenizer, words)
+        expected = predict_probabilities(self.model, self.tokenizer, [" ".join(words)])[0]
+        self.assertTrue(torch.allclose(probabilities, expected, atol=1e-5))
+        self.assertEqual(len(word_flags), len(words))
+
+    def test_windows_aggregate_over_the_whole_text(self):
+        """Window mode scores every overlapping window and keeps the highest probability per label."""
+        words = "you are an idiot have a nice day i will hate this test".split() * 3
+        window = window_settings(LONG_TEXT_WINDOW, 12, 4)
+        probabilities = predict_probabilities(self.model, self.tokenizer, [" ".join(words), "a nice day"], **window)
+
+        # Every vocabulary word is one token: windows hold 10 words and advance by 6
+        windows = [" ".join(words[start:start + 10]) for start in range(0, len(words) - 4, 6)]
+        expected = predict_probabilities(self.model, self.tokenizer, windows).max(dim=0).values
+        self.assertTrue(torch.allclose(probabilities[0], expected, atol=1e-5))
+
+        # Short texts fit in one window and score as before
+        short = predict_probabilities(self.model, self.tokenizer, ["a nice day"])[0]
+        self.assertTrue(torch.allclose(probabilities[1], short, atol=1e-5))
+
+        mean_window = window_settings(LONG_TEXT_WINDOW, 12, 4, "mean")
+        mean = predict_probabilities(self.model, self.tokenizer, [" ".join(words)], **mean_window)[0]
+        expected = predict_probabilities(self.model, self.tokenizer, windows).mean(dim=0)
+        self.assertTrue(torch.allclose(mean, expected, atol=1e-5))
+
+    def test_truncate_mode_has_no_window_settings(self):
+        """Truncate mode leaves the scoring helpers on their defaults."""
+        self.assertEqual(window_settings(LONG_TEXT_TRUNCATE, 12, 4), {})
+
+    def test_windowed_attribution_covers_every_word(self):
+        """Attribution over windows classifies like windowed scoring and flags words past the first window."""
+        words = "you are an idiot have a nice day i will hate this test".split() * 3
+        window = window_settings(LONG_TEXT_WINDOW, 12, 4)
+        with patch('app.inference.THRESHOLD', 0.0):
+            probabilities, word_flags = attribute_words(self.model, self.tokenizer, words, **window)
+
+        expected = predict_probabilities(self.model, self.tokenizer, [" ".join(words)], **window)[0]
+        self.assertTrue(torch.allclose(probabilities, expected, atol=1e-5))
+        self.assertEqual(len(word_flags), len(words))
+        self.assertTrue(any(any(flags) for flags in word_flags[10:]))
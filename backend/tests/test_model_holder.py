@@ -0,0 +1,162 @@
+# Import necessary modules and classes
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+import torch
+from unittest.mock import patch
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from config.model_manager import ModelManager
+from config.model_holder import ModelHolder, ModelLoadError, load_pretrained
+from tests.fixtures import build_tiny_model
+
+# Tests for the process-local model holder
+class ModelHolderTest(SimpleTestCase):
+    def setUp(self):
+        self.loads = []
+        self.release = {}
+
+    def loader(self, model_path):
+        self.loads.append(model_path)
+        if model_path in self.release:
+            self.release[model_path].wait(5)
+        return type("Loaded", (), {"model_path": model_path, "version": model_path.rsplit("/", 1)[-1],
+                                   "refcount": 0, "nbytes": 1024 * 1024})()
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_concurrent_gets_load_once_and_return_live_object(self):
+        """Every caller gets the same live object and the model is loaded once."""
+        holder = ModelHolder(loader=self.loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(holder.get("/models/v1"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.loads, ["/models/v1"])
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_unload_waits_for_references(self):
+        """A model in use by a request is not unloaded."""
+        holder = ModelHolder(loader=self.loader)
+        with holder.acquire("/models/v1") as loaded:
+            self.assertEqual(loaded.refcount, 1)
+            self.assertFalse(holder.unload("/models/v1"))
+        self.assertTrue(holder.unload("/models/v1"))
+        self.assertEqual(holder.loaded_paths(), [])
+
+    def test_load_pretrained(self):
+        """Saved models load in eval mode and missing versions raise ModelLoadError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_tiny_model(tmpdir)
+            loaded = load_pretrained(tmpdir)
+            self.assertFalse(loaded.model.training)
+            with self.assertRaises(ModelLoadError):
+                load_pretrained(tmpdir + "/missing")
+
+    @unittest.skipUnless(os.path.exists("/proc/self/maps"), "needs /proc/self/maps")
+    def test_weights_are_memory_mapped(self):
+        """Parameters point into the mapped model.safetensors file instead of private memory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model, tokenizer = build_tiny_model(tmpdir)
+            loaded = load_pretrained(tmpdir)
+
+            weights_path = os.path.realpath(os.path.join(tmpdir, "model.safetensors"))
+            with open("/proc/self/maps") as f:
+                ranges = [
+                    [int(address, 16) for address in line.split()[0].split("-")]
+                    for line in f if line.rstrip().endswith(weights_path)
+                ]
+            parameters = list(loaded.model.parameters())
+            mapped = [p for p in parameters if any(start <= p.data_ptr() < end for start, end in ranges)]
+            self.assertEqual(len(mapped), len(parameters))
+
+            inputs = tokenizer(["you are an idiot"], return_tensors="pt")
+            with torch.no_grad():
+                self.assertTrue(torch.allclose(loaded.model(**inputs).logits, model(**inputs).logits))
+
+    def test_lru_eviction_within_memory_budget(self):
+        """Versions stay resident until the budget is exceeded, then the least recently used goes."""
+        holder = ModelHolder(loader=self.loader, memory_budget_mb=2)
+        holder.get("/models/v1")
+        holder.get("/models/v2")
+        holder.get("/models/v1")  # v1 is now the most recently used
+        self.assertEqual(holder.loaded_paths(), ["/models/v2", "/models/v1"])
+
+        holder.get("/models/v3")
+        self.assertEqual(holder.loaded_paths(), ["/models/v1", "/models/v3"])
+        self.assertEqual(holder.stats()["evictions"], 1)
+
+        # Switching back to a resident version does not reload it
+        holder.get("/models/v1")
+        self.assertEqual(self.loads, ["/models/v1", "/models/v2", "/models/v3"])
+
+    def test_models_in_use_are_not_evicted(self):
+        """A version held by an in-flight request survives eviction."""
+        holder = ModelHolder(loader=self.loader, memory_budget_mb=1)
+        with holder.acquire("/models/v1"):
+            holder.get("/models/v2")
+            self.assertIn("/models/v1", holder.loaded_paths())
+
+    def test_version_change_swaps_in_background(self):
+        """Requests keep the old model while the new version loads, then switch atomically."""
+        holder = ModelHolder(loader=self.loader, warm_up=lambda loaded: None)
+        self.assertEqual(holder.get_active("/models/v1").version, "v1")
+
+        self.release["/models/v2"] = threading.Event()
+        self.assertEqual(holder.get_active("/models/v2").version, "v1")
+        self.assertEqual(holder.stats()["pending"], "v2")
+        self.assertEqual(holder.get_active("/models/v2").version, "v1")
+
+        self.release["/models/v2"].set()
+        self.wait_for(lambda: holder.stats()["active"] == "v2")
+        self.assertEqual(holder.get_active("/models/v2").version, "v2")
+        self.assertEqual(self.loads, ["/models/v1", "/models/v2"])
+
+    def test_version_change_reaches_other_workers(self):
+        """A version selected in one worker is read by a forked worker and swapped in by its holder."""
+        self.addCleanup(caches['default'].delete, 'current_model_version')
+        context = multiprocessing.get_context("fork")
+        selected, versions = context.Event(), context.Queue()
+
+        def other_worker():
+            # Forked before the change, so it only sees it through the shared cache
+            selected.wait(5)
+            with patch('config.model_manager.cache', caches.create_connection('default')):
+                versions.put(ModelManager.get_current_version())
+
+        process = context.Process(target=other_worker)
+        process.start()
+        ModelManager.set_current_version("trained_model_v2.0.0")
+        selected.set()
+        self.assertEqual(versions.get(timeout=5), "trained_model_v2.0.0")
+        process.join(5)
+
+        # The holder's warm-swap check follows the shared version
+        holder = ModelHolder(loader=self.loader, warm_up=lambda loaded: None)
+        holder.get_active(ModelManager.get_model_path("trained_model_v1.0.0"))
+        with patch('config.model_manager.cache', caches.create_connection('default')):
+            holder.get_active(ModelManager.get_model_path())
+        self.wait_for(lambda: holder.stats()["active"] == "trained_model_v2.0.0")
+        self.assertEqual(holder.stats()["active"], "trained_model_v2.0.0")
+
+    def test_failed_swap_keeps_current_model(self):
+        """A version that cannot be loaded leaves the active model in place."""
+        def loader(model_path):
+            if model_path.endswith("broken"):
+                raise ModelLoadError(model_path=model_path)
+            return self.loader(model_path)
+
+        holder = ModelHolder(loader=loader, warm_up=lambda loaded: None)
+        holder.get_active("/models/v1")
+        holder.activate("/models/broken")
+        self.wait_for(lambda: holder.stats()["pending"] is None)
+        self.assertEqual(holder.get_active("/models/broken").version, "v1")
+        self.assertFalse(holder.activate("/models/broken"))
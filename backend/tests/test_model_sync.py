@@ -0,0 +1,189 @@
+# Import necessary modules and classes
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from unittest.mock import patch
+from django.test import SimpleTestCase
+from config.model_sync import ModelRepoSync, ModelSyncError, exclude_from_model_repo
+from ai_model.utils.model_save import get_next_version, push_model_and_metrics
+
+
+def git(cwd, *args):
+    """Run a git command with a fixed identity, as the tests have no global git config."""
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+# Tests for the background model repository sync, against a local bare repository
+class ModelRepoSyncTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.remote = os.path.join(self.tmpdir.name, "remote.git")
+        self.seed = os.path.join(self.tmpdir.name, "seed")
+        self.local = os.path.join(self.tmpdir.name, "models")
+
+        git(self.tmpdir.name, "init", "--quiet", "--bare", "--initial-branch=main", self.remote)
+        # Serve partial clones, as GitHub does
+        git(self.remote, "config", "uploadpack.allowFilter", "true")
+        git(self.tmpdir.name, "clone", "--quiet", self.remote, self.seed)
+        git(self.seed, "checkout", "--quiet", "-b", "main")
+        self.publish("trained_model_v1.0.0")
+
+        patcher = patch('config.model_manager.ModelManager.get_current_version', return_value="trained_model_v1.0.0")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sync = self.make_sync(interval=0.05)
+
+    def tearDown(self):
+        self.sync.stop(timeout=5)
+        self.tmpdir.cleanup()
+
+    def make_sync(self, **kwargs):
+        return ModelRepoSync(self.local, f"file://{self.remote}", **kwargs)
+
+    def publish(self, version):
+        """Commit a model version to the seed clone and push it to the remote."""
+        os.makedirs(os.path.join(self.seed, version))
+        with open(os.path.join(self.seed, version, "config.json"), "w") as f:
+            f.write(f'{{"version": "{version}"}}')
+        git(self.seed, "add", version)
+        git(self.seed, "commit", "--quiet", "-m", f"Add {version}")
+        git(self.seed, "push", "--quiet", "origin", "main")
+
+    def missing_blobs(self):
+        """Objects of the remote branch that were never downloaded."""
+        output = subprocess.run(
+            ["git", f"--git-dir={self.sync.git_dir}", "rev-list", "--objects", "--missing=print", "origin/main"],
+            check=True, capture_output=True, text=True
+        ).stdout
+        return [line for line in output.splitlines() if line.startswith("?")]
+
+    def test_checks_out_only_the_served_version(self):
+        """Versions that are neither served nor pinned are listed but their files are not fetched."""
+        self.publish("trained_model_v2.0.0")
+        self.assertEqual(self.sync.known_versions(), [])
+
+        self.assertEqual(self.sync.sync_once(), ["trained_model_v1.0.0"])
+        self.assertTrue(os.path.isfile(os.path.join(self.local, "trained_model_v1.0.0", "config.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.local, "trained_model_v2.0.0")))
+        self.assertEqual(self.sync.known_versions(), ["trained_model_v1.0.0", "trained_model_v2.0.0"])
+        self.assertEqual(len(self.missing_blobs()), 1)
+        self.assertEqual(self.sync.sync_once(), [])
+
+    def test_pinned_versions_are_checked_out(self):
+        """Pinned versions are kept checked out next to the served one."""
+        self.publish("trained_model_v2.0.0")
+        sync = self.make_sync(pinned_versions=["trained_model_v2.0.0"])
+        self.assertEqual(sync.sync_once(), ["trained_model_v1.0.0", "trained_model_v2.0.0"])
+        self.assertEqual(self.missing_blobs(), [])
+
+    def test_materialize_on_demand(self):
+        """A version published after the last sync is fetched and checked out when asked for."""
+        self.sync.sync_once()
+        self.publish("trained_model_v3.0.0")
+
+        self.assertTrue(self.sync.materialize("trained_model_v3.0.0"))
+        self.assertTrue(os.path.isfile(os.path.join(self.local, "trained_model_v3.0.0", "config.json")))
+        self.assertFalse(self.sync.materialize("trained_model_v3.0.0"))
+        with self.assertRaises(ModelSyncError):
+            self.sync.materialize("trained_model_v9.0.0")
+
+    def test_fetched_blobs_are_cached(self):
+        """A version fetched once is checked out again without the remote."""
+        self.sync.sync_once()
+        shutil.rmtree(self.remote)
+        shutil.rmtree(os.path.join(self.local, "trained_model_v1.0.0"))
+
+        self.assertTrue(self.sync.materialize("trained_model_v1.0.0"))
+        self.assertTrue(os.path.isfile(os.path.join(self.local, "trained_model_v1.0.0", "config.json")))
+
+    def test_separate_blob_cache(self):
+        """The blob cache can live outside the models directory."""
+        git_dir = os.path.join(self.tmpdir.name, "cache.git")
+        sync = self.make_sync(git_dir=git_dir)
+        self.assertEqual(sync.sync_once(), ["trained_model_v1.0.0"])
+        self.assertTrue(os.path.isfile(os.path.join(git_dir, "HEAD")))
+        self.assertFalse(os.path.exists(os.path.join(self.local, ".git")))
+
+        # Local files are excluded in the blob cache, not in a .git under the models directory
+        with patch('config.model_sync.model_sync', sync):
+            self.assertTrue(exclude_from_model_repo(os.path.join(self.local, "trained_model_v1.0.0.onnx"), "*.onnx*"))
+        with open(os.path.join(git_dir, "info", "exclude")) as f:
+            self.assertEqual(f.read().splitlines()[-2:], [".sync.lock", "*.onnx*"])
+
+    def test_local_files_survive_sync(self):
+        """Artifacts generated next to the versions are never reset or cleaned."""
+        self.sync.sync_once()
+        artifact = os.path.join(self.local, "trained_model_v1.0.0.onnx")
+        with open(artifact, "w") as f:
+            f.write("artifact")
+
+        self.publish("trained_model_v2.0.0")
+        self.sync.materialize("trained_model_v2.0.0")
+        self.sync.sync_once()
+        self.assertTrue(os.path.exists(artifact))
+
+    def test_publish_keeps_the_clone_partial(self):
+        """A trained version is pushed on top of the remote without checking out other versions."""
+        self.publish("trained_model_v2.0.0")
+        self.sync.sync_once()
+        git(self.local, f"--git-dir={self.sync.git_dir}", "config", "user.name", "Test")
+        git(self.local, f"--git-dir={self.sync.git_dir}", "config", "user.email", "test@example.com")
+
+        # The next version number accounts for versions that are only on the remote
+        version = get_next_version(self.local, tuple(self.sync.known_versions()))
+        self.assertEqual(version, "v3.0.0")
+        os.makedirs(os.path.join(self.local, "trained_model_v3.0.0"))
+        with open(os.path.join(self.local, "trained_model_v3.0.0", "config.json"), "w") as f:
+            f.write('{"version": "trained_model_v3.0.0"}')
+        os.makedirs(os.path.join(self.local, "metrics"))
+        metrics_file = os.path.join(self.local, "metrics", "metrics_v3.0.0.json")
+        with open(metrics_file, "w") as f:
+            f.write("{}")
+
+        self.assertTrue(push_model_and_metrics(self.local, version, "trained_model_v3.0.0", metrics_file))
+
+        remote_tree = subprocess.run(
+            ["git", "ls-tree", "-r", "--name-only", "main"], cwd=self.remote, check=True, capture_output=True, text=True
+        ).stdout.split()
+        self.assertEqual(remote_tree, [
+            "metrics/metrics_v3.0.0.json", "trained_model_v1.0.0/config.json",
+            "trained_model_v2.0.0/config.json", "trained_model_v3.0.0/config.json",
+        ])
+        self.assertIn("trained_model_v3.0.0", self.sync.known_versions())
+        # Nothing else was checked out or downloaded
+        self.assertFalse(os.path.exists(os.path.join(self.local, "trained_model_v2.0.0")))
+        self.assertEqual(len(self.missing_blobs()), 1)
+
+    def test_skips_while_another_process_syncs(self):
+        """Only one holder of the sync lock fetches at a time."""
+        with self.make_sync()._repo_lock() as acquired:
+            self.assertTrue(acquired)
+            self.assertEqual(self.sync.sync_once(), [])
+        self.assertEqual(self.sync.sync_once(), ["trained_model_v1.0.0"])
+
+    def test_background_sync_picks_up_new_versions(self):
+        """The background thread keeps syncing and checks out a newly pinned version once published."""
+        self.sync.pinned_versions = ["trained_model_v2.0.0"]
+        self.assertTrue(self.sync.start())
+        self.assertFalse(self.sync.start())
+        self.publish("trained_model_v2.0.0")
+
+        target = os.path.join(self.local, "trained_model_v2.0.0")
+        deadline = time.monotonic() + 10
+        while not os.path.isdir(target) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(os.path.isdir(target))
+
+        self.sync.stop(timeout=5)
+        self.assertFalse(self.sync.stats()["running"])
+        versions = [d for d in os.listdir(self.local) if d.startswith("trained_model")]
+        self.assertEqual(sorted(versions), ["trained_model_v1.0.0", "trained_model_v2.0.0"])
+
+    def test_disabled_with_zero_interval(self):
+        """An interval of 0 turns the background sync off."""
+        self.assertFalse(self.make_sync(interval=0).start())
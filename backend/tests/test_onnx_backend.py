@@ -0,0 +1,67 @@
+# Import necessary modules and classes
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import torch
+from django.test import SimpleTestCase
+from app.inference import predict_probabilities
+from config.model_holder import ModelHolder, load_pretrained, BACKEND_ONNX, BACKEND_TORCH
+from config.onnx_backend import onnx_artifact_path, onnxruntime, OnnxExportError
+from tests.fixtures import build_tiny_model
+
+# Tests for the ONNX Runtime inference backend
+@unittest.skipIf(onnxruntime is None, "onnxruntime is not installed")
+class OnnxBackendTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmpdir.name, "trained_model_v1.0.0")
+        self.model, self.tokenizer = build_tiny_model(self.model_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_export_matches_pytorch_and_is_reused(self):
+        """The first load exports the model once, later loads reuse the artifact."""
+        loaded = load_pretrained(self.model_path, BACKEND_ONNX)
+        self.assertEqual(loaded.backend, BACKEND_ONNX)
+        self.assertFalse(loaded.supports_gradients)
+        self.assertTrue(os.path.exists(onnx_artifact_path(self.model_path)))
+
+        with patch('config.onnx_backend.export_onnx', side_effect=AssertionError("re-exported")):
+            reloaded = load_pretrained(self.model_path, BACKEND_ONNX)
+
+        # Different batch sizes and lengths exercise the dynamic axes
+        texts = ["you are an idiot", "have a nice day", "ok", "see you tomorrow you idiot"]
+        expected = predict_probabilities(self.model, self.tokenizer, texts)
+        for candidate in (loaded, reloaded):
+            probabilities = predict_probabilities(candidate.model, candidate.tokenizer, texts)
+            self.assertTrue(torch.allclose(probabilities, expected, atol=1e-4))
+
+    def test_mismatching_export_falls_back_to_pytorch(self):
+        """An export that fails verification is discarded and PyTorch serves instead."""
+        with patch('config.onnx_backend.verify_onnx', side_effect=OnnxExportError("mismatch")):
+            loaded = load_pretrained(self.model_path, BACKEND_ONNX)
+
+        self.assertEqual(loaded.backend, BACKEND_TORCH)
+        self.assertFalse(os.path.exists(onnx_artifact_path(self.model_path)))
+        self.assertFalse(os.path.exists(onnx_artifact_path(self.model_path) + ".tmp"))
+
+    def test_sessions_use_the_planned_threads_and_are_rebuilt_after_fork(self):
+        """Sessions take this process's thread share, and a forked worker rebuilds them with its own."""
+        holder = ModelHolder(loader=lambda model_path: load_pretrained(model_path, BACKEND_ONNX))
+        with patch('config.cpu_layout.inference_threads', return_value=(1, 1)):
+            loaded = holder.get_active(self.model_path)
+        options = loaded.model.session.get_session_options()
+        self.assertEqual((options.intra_op_num_threads, options.inter_op_num_threads), (1, 1))
+
+        inherited = loaded.model.session
+        with patch('config.cpu_layout.inference_threads', return_value=(2, 1)):
+            self.assertEqual(holder.after_fork(), 1)
+        self.assertIsNot(loaded.model.session, inherited)
+        options = loaded.model.session.get_session_options()
+        self.assertEqual((options.intra_op_num_threads, options.inter_op_num_threads), (2, 1))
+
+        expected = predict_probabilities(self.model, self.tokenizer, ["you are an idiot"])
+        probabilities = predict_probabilities(loaded.model, loaded.tokenizer, ["you are an idiot"])
+        self.assertTrue(torch.allclose(probabilities, expected, atol=1e-4))
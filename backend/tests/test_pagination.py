@@ -0,0 +1,112 @@
+# Import necessary modules and classes
+from datetime import timedelta
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from app.models import TextAnalysis
+from app.pagination import keyset_page, estimate_total, encode_cursor, decode_cursor
+
+
+# Tests for keyset pagination of the home page and the admin dashboard
+class KeysetPaginationTests(TestCase):
+    databases = {'default', 'admin_db'}
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # Pairs of rows share a timestamp, so the id has to break the ties
+        TextAnalysis.objects.bulk_create(
+            TextAnalysis(text=f"text {index}", toxic=index % 2 == 0, created_at=now - timedelta(seconds=index // 2))
+            for index in range(25)
+        )
+        cls.newest_first = list(TextAnalysis.objects.order_by('-created_at', '-id'))
+
+    def walk(self, queryset, per_page):
+        """Follow the next cursors from the first page to the last."""
+        pages = [keyset_page(queryset, per_page=per_page)]
+        while pages[-1].has_next:
+            pages.append(keyset_page(queryset, after=pages[-1].next_cursor, per_page=per_page))
+        return pages
+
+    def test_pages_cover_every_row_once(self):
+        """Walking forward visits every row in order, ties included."""
+        pages = self.walk(TextAnalysis.objects.order_by('-created_at', '-id'), per_page=10)
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([row for page in pages for row in page], self.newest_first)
+        self.assertFalse(pages[0].has_previous)
+        self.assertTrue(pages[-1].has_previous)
+
+    def test_previous_cursor_returns_the_previous_page(self):
+        """Walking back with the previous cursors gives the same pages."""
+        queryset = TextAnalysis.objects.order_by('-created_at', '-id')
+        pages = self.walk(queryset, per_page=10)
+        for page, previous in zip(pages[1:], pages):
+            back = keyset_page(queryset, before=page.previous_cursor, per_page=10)
+            self.assertEqual(list(back), list(previous))
+            self.assertEqual(back.has_previous, previous.has_previous)
+            self.assertTrue(back.has_next)
+
+    def test_invalid_cursor_gives_first_page(self):
+        """A tampered cursor falls back to the first page."""
+        page = keyset_page(TextAnalysis.objects.order_by('-created_at', '-id'), after="not-a-cursor", per_page=10)
+        self.assertEqual(list(page), self.newest_first[:10])
+        self.assertIsNone(decode_cursor(encode_cursor([1])[:-3] + "!!"))
+
+        # Readable cursors holding values of the wrong type are ignored too
+        newest = self.newest_first[0]
+        for values in (["abc", 1], [1, 2], [newest.created_at, "x"], [None, 1], [newest.created_at]):
+            for cursor in ("after", "before"):
+                page = keyset_page(TextAnalysis.objects.order_by('-created_at', '-id'),
+                                   **{cursor: encode_cursor(values)}, per_page=10)
+                self.assertEqual(list(page), self.newest_first[:10])
+        page = keyset_page(TextAnalysis.objects.search("text"), after=encode_cursor(["best", newest.created_at, 1]))
+        self.assertIsNone(page.previous_cursor)
+        for values in (["abc", 1], [newest.created_at, "x"]):
+            response = self.client.get(reverse('home'), {'after': encode_cursor(values)})
+            self.assertEqual(response.status_code, 200)
+
+    def test_ranked_search_pages(self):
+        """Search results keep their rank order across pages."""
+        queryset = TextAnalysis.objects.search("text")
+        pages = self.walk(queryset, per_page=7)
+        self.assertEqual([row for page in pages for row in page], list(queryset))
+
+    def test_total_is_exact_up_to_the_cap(self):
+        """Small results are counted exactly, large ones estimated from the newest rows."""
+        self.assertEqual(estimate_total(TextAnalysis.objects.all(), cap=100), (25, True))
+        self.assertEqual(estimate_total(TextAnalysis.objects.all(), cap=10), (25, False))
+        total, exact = estimate_total(TextAnalysis.objects.filter(toxic=True), cap=10)
+        self.assertFalse(exact)
+        self.assertTrue(11 <= total <= 15)
+
+    def test_deep_page_reads_the_index(self):
+        """A later page seeks into the created_at index instead of skipping rows with OFFSET."""
+        first = self.client.get(reverse('home')).context['analyses']
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('home'), {'after': first.next_cursor})
+
+        sql = next(query["sql"] for query in queries.captured_queries if "LIMIT 11" in query["sql"])
+        self.assertNotIn("OFFSET", sql)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " | ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("SEARCH moderation_textanalysis USING INDEX analysis_created_idx", plan)
+
+    def test_dashboard_pages(self):
+        """The dashboard renders one page with links that keep the filters."""
+        session = self.client.session
+        session['admin-token'] = 'token'
+        session.save()
+
+        with patch('CSA_AdminApp.views.DASHBOARD_PAGE_SIZE', 5):
+            response = self.client.get(reverse('dashboard'), {'toxic': 'yes'})
+            self.assertEqual(len(response.context['data']), 5)
+            self.assertContains(response, "5 of 13 entries")
+            self.assertContains(response, "?toxic=yes&after=")
+
+            later = self.client.get(reverse('dashboard'), {'toxic': 'yes', 'after': response.context['data'].next_cursor})
+        self.assertTrue(all(entry.toxic for entry in later.context['data']))
+        self.assertFalse(set(response.context['data']) & set(later.context['data']))
@@ -0,0 +1,64 @@
+# Import necessary modules and classes
+import io
+import os
+import tempfile
+from unittest.mock import patch
+import torch
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from app.inference import LABELS, predict_probabilities
+from config.model_holder import load_pretrained, BACKEND_QUANTIZED
+from config.quantization import quantized_artifact_path
+from tests.fixtures import build_tiny_model
+
+# Tests for the dynamic int8 quantized inference mode
+class QuantizedBackendTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmpdir.name, "trained_model_v1.0.0")
+        self.model, self.tokenizer = build_tiny_model(self.model_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_quantized_model_is_cached_next_to_version(self):
+        """The first load quantizes and saves the artifact, later loads reuse it."""
+        loaded = load_pretrained(self.model_path, BACKEND_QUANTIZED)
+        self.assertTrue(os.path.exists(quantized_artifact_path(self.model_path)))
+        self.assertFalse(loaded.supports_gradients)
+
+        with patch('config.quantization.quantize_model', side_effect=AssertionError("re-quantized")):
+            reloaded = load_pretrained(self.model_path, BACKEND_QUANTIZED)
+
+        texts = ["you are an idiot", "have a nice day"]
+        expected = predict_probabilities(self.model, self.tokenizer, texts)
+        for candidate in (loaded, reloaded):
+            probabilities = predict_probabilities(candidate.model, candidate.tokenizer, texts)
+            self.assertTrue(torch.allclose(probabilities, expected, atol=1e-2))
+
+    def test_check_uses_the_serving_window_settings(self):
+        """The comparison scores texts with the long-text settings requests are served with, and reports them."""
+        data_path = os.path.join(self.tmpdir.name, "test_data.csv")
+        with open(data_path, "w") as f:
+            f.write("comment_text," + ",".join(LABELS) + "\n")
+            f.write("you are an idiot," + ",".join(["1"] + ["0"] * 5) + "\n")
+            f.write("have a nice day," + ",".join(["0"] * 6) + "\n")
+
+        calls = []
+        def recording_predict(model, tokenizer, texts, **window):
+            calls.append(window)
+            return predict_probabilities(model, tokenizer, texts, **window)
+
+        out = io.StringIO()
+        with patch('config.model_manager.ModelManager.get_model_path', return_value=self.model_path), \
+                patch('app.management.commands.check_quantization.predict_probabilities', side_effect=recording_predict):
+            call_command("check_quantization", data=data_path, long_text_mode="window", window_size=16,
+                         stride=4, aggregation="mean", stdout=out)
+
+        self.assertEqual(calls, [{"max_length": 16, "stride": 4, "aggregation": "mean"}] * 2)
+        self.assertIn("Scoring: window mode, 16-token windows, stride 4, mean aggregation", out.getvalue())
+
+        out = io.StringIO()
+        with patch('config.model_manager.ModelManager.get_model_path', return_value=self.model_path):
+            call_command("check_quantization", data=data_path, long_text_mode="truncate", stdout=out)
+        self.assertIn("Scoring: truncate mode, first 512 tokens of each text", out.getvalue())
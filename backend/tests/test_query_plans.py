@@ -0,0 +1,73 @@
+# Import necessary modules and classes
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from app.models import TextAnalysis
+
+TABLE = TextAnalysis._meta.db_table
+
+
+# Tests checking that the list views read TextAnalysis through its indexes
+class QueryPlanTests(TestCase):
+    databases = {'default', 'admin_db'}
+
+    @classmethod
+    def setUpTestData(cls):
+        TextAnalysis.objects.bulk_create(
+            TextAnalysis(text=f"text {index}", toxic=index % 3 == 0, threat=index % 50 == 0)
+            for index in range(300)
+        )
+        # Give the planner real statistics, as on a production-sized table
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def plans(self, url, session=None):
+        """Run `url` and return the query plan of every SELECT it sent to the analyses table."""
+        if session:
+            client_session = self.client.session
+            client_session.update(session)
+            client_session.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        plans = {}
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                sql = query["sql"]
+                if sql.startswith("SELECT") and TABLE in sql:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                    plans[sql] = " | ".join(row[-1] for row in cursor.fetchall())
+        self.assertTrue(plans)
+        return plans
+
+    def assertIndexed(self, plans, index=None):
+        """Every query reads the table through an index and needs no sort of its own."""
+        for sql, plan in plans.items():
+            self.assertIn("INDEX", plan, f"{sql}\n{plan}")
+            self.assertNotIn("TEMP B-TREE", plan, f"{sql}\n{plan}")
+        if index:
+            self.assertTrue(any(index in plan for plan in plans.values()), plans)
+
+    def test_home_listing(self):
+        """The newest-first home page walks the created_at index."""
+        self.assertIndexed(self.plans(reverse('home')), "analysis_created_idx")
+
+    def test_home_toxic_filter(self):
+        """The toxic filter reads the (toxic, created_at) index in listing order."""
+        self.assertIndexed(self.plans(reverse('home') + "?filter=toxic"), "analysis_toxic_created_idx")
+
+    def test_home_clean_filter(self):
+        """The clean filter uses the same composite index."""
+        self.assertIndexed(self.plans(reverse('home') + "?filter=clean"), "analysis_toxic_created_idx")
+
+    def test_dashboard_label_filter(self):
+        """Filtering flagged rows of a label uses its partial index."""
+        plans = self.plans(reverse('dashboard') + "?threat=yes", session={'admin-token': 'token'})
+        self.assertIndexed(plans, "analysis_threat_idx")
+
+    def test_dashboard_listing(self):
+        """The unfiltered dashboard is ordered by the created_at index."""
+        plans = self.plans(reverse('dashboard'), session={'admin-token': 'token'})
+        self.assertIndexed(plans, "analysis_created_idx")
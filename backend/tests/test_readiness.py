@@ -0,0 +1,64 @@
+# Import necessary modules and classes
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from config.config import BASE_DIR
+from config.model_holder import ModelHolder
+from tests.fixtures import build_tiny_model
+
+# Tests for lazy model loading, explicit warm-up and the readiness probe
+class ReadinessTest(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        build_tiny_model(self.tmpdir.name)
+        self.holder = ModelHolder()
+        for patcher in (patch('config.warmup.ModelManager.get_model_path', return_value=self.tmpdir.name),
+                        patch('config.warmup.model_holder', self.holder),
+                        patch('app.views.model_holder', self.holder),
+                        patch('config.warmup.model_sync')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_ready_only_after_warm_up(self):
+        """The probe answers 503 while cold, warms up in the background, then answers 200."""
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 503)
+
+        deadline = time.monotonic() + 10
+        while not self.holder.is_ready() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["model"], os.path.basename(self.tmpdir.name))
+
+    def test_warm_up_command(self):
+        """The management command loads and warms the active model."""
+        out = StringIO()
+        call_command("warm_up", "--skip-sync", stdout=out)
+        self.assertTrue(self.holder.is_ready())
+        self.assertIn("ready", out.getvalue())
+
+    def test_importing_the_urlconf_loads_no_model(self):
+        """Loading every view, as management commands do, imports neither torch nor the model."""
+        code = (
+            "import django, sys; django.setup();"
+            "from django.urls import get_resolver; get_resolver().url_patterns;"
+            "from config.model_holder import model_holder;"
+            "assert 'torch' not in sys.modules, 'torch imported';"
+            "assert not model_holder.is_ready()"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([BASE_DIR, os.path.dirname(BASE_DIR)]),
+                   DJANGO_SETTINGS_MODULE="config.settings")
+        result = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
@@ -0,0 +1,110 @@
+# Import necessary modules and classes
+import threading
+import time
+from unittest.mock import patch
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from app.models import TextAnalysis
+from app.result_cache import ResultCache, SingleFlight, result_cache
+from tests.fixtures import TinyModelViewMixin
+
+# Tests for the content-hash result cache
+class ResultCacheTest(SimpleTestCase):
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses."""
+        cache = ResultCache(max_entries=10, ttl=60)
+        key = ResultCache.make_key("you are an idiot", "words")
+        self.assertIsNone(cache.get("v1", key))
+        cache.set("v1", key, "result")
+        self.assertEqual(cache.get("v1", key), "result")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+
+    def test_key_normalizes_whitespace_and_scopes_mode(self):
+        """Whitespace differences share a key, highlighting modes do not."""
+        self.assertEqual(ResultCache.make_key(" you  are\tan idiot ", "words"),
+                         ResultCache.make_key("you are an idiot", "words"))
+        self.assertNotEqual(ResultCache.make_key("you are an idiot", "words"),
+                            ResultCache.make_key("you are an idiot", "attribution"))
+
+    def test_version_change_invalidates(self):
+        """Entries cached for an older model version are dropped."""
+        cache = ResultCache(max_entries=10, ttl=60)
+        cache.set("v1", "key", "old")
+        self.assertIsNone(cache.get("v2", "key"))
+        self.assertEqual(cache.stats()["invalidations"], 1)
+
+    def test_lru_eviction_and_ttl(self):
+        """The cache stays bounded and expired entries are not served."""
+        cache = ResultCache(max_entries=2, ttl=60)
+        cache.set("v1", "a", 1)
+        cache.set("v1", "b", 2)
+        cache.get("v1", "a")
+        cache.set("v1", "c", 3)
+        self.assertIsNone(cache.get("v1", "b"))
+        self.assertEqual(cache.get("v1", "a"), 1)
+
+        expired = ResultCache(max_entries=2, ttl=-1)
+        expired.set("v1", "a", 1)
+        self.assertIsNone(expired.get("v1", "a"))
+
+# Tests for serving repeated texts from the cache in the analyze view
+class AnalyzeTextCacheViewTests(TinyModelViewMixin, TestCase):
+    def view_patches(self):
+        return (patch('app.views.WRITE_BEHIND_ENABLED', False),)
+
+    def setUp(self):
+        super().setUp()
+        result_cache.clear()
+
+    def test_repeated_text_skips_the_model(self):
+        """A repeated text is answered from the cache and still recorded."""
+        first = self.client.post(reverse('analyze_text'), {'text': 'you are an idiot'}).json()
+        self.assertTrue(first['success'])
+
+        with patch('app.inference.analyze', side_effect=AssertionError("model should not run")):
+            second = self.client.post(reverse('analyze_text'), {'text': 'you  are an idiot'}).json()
+
+        self.assertEqual(second['results'], first['results'])
+        self.assertEqual(second['flagged_words'], first['flagged_words'])
+        self.assertEqual(TextAnalysis.objects.count(), 2)
+        self.assertEqual(self.client.get(reverse('inference_stats')).json()['result_cache']['hits'], 1)
+
+# Tests for in-flight request coalescing
+class SingleFlightTest(SimpleTestCase):
+    def test_concurrent_callers_share_one_execution(self):
+        """Callers arriving while a key is in flight wait for it instead of running again."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("key", work)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.do("key", work))) for _ in range(5)]
+        for thread in followers:
+            thread.start()
+        while flight.stats()["coalesced"] < 5:
+            time.sleep(0.01)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["result"] * 6)
+        self.assertEqual(flight.stats(), {"in_flight": 0, "executions": 1, "coalesced": 5})
+
+    def test_errors_are_shared_and_key_is_released(self):
+        """A failure is raised to the caller and the key can be retried afterwards."""
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+        self.assertEqual(flight.do("key", lambda: "ok"), "ok")
@@ -0,0 +1,72 @@
+# Import necessary modules and classes
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from app.models import TextAnalysis, fts_query
+
+
+# Tests for the full-text search index and the search parameters of the list views
+class FullTextSearchTests(TestCase):
+    databases = {'default', 'admin_db'}
+
+    def setUp(self):
+        self.once = TextAnalysis.objects.create(text="you are an idiot")
+        self.twice = TextAnalysis.objects.create(text="idiot, what an idiot thing to say")
+        self.clean = TextAnalysis.objects.create(text="have a nice day")
+
+    def search(self, query):
+        return list(TextAnalysis.objects.search(query))
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        """Triggers keep the FTS index in sync with the table."""
+        self.assertEqual(set(self.search("idiot")), {self.once, self.twice})
+
+        self.clean.text = "nice idiot"
+        self.clean.save()
+        self.assertIn(self.clean, self.search("idiot"))
+        self.assertEqual(self.search("day"), [])
+
+        self.once.delete()
+        TextAnalysis.objects.bulk_create([TextAnalysis(text="bulk idiot")])
+        self.assertEqual(len(self.search("idiot")), 3)
+        self.assertNotIn(self.once, self.search("idiot"))
+
+    def test_ranked_and_prefix_search(self):
+        """Texts that match more often rank first, and words match as prefixes."""
+        self.assertEqual(self.search("idiot"), [self.twice, self.once])
+        self.assertEqual(set(self.search("idi")), {self.once, self.twice})
+        self.assertEqual(self.search("IDIOT nice"), [])
+
+    def test_operators_in_input_are_not_interpreted(self):
+        """Quotes, operators and punctuation-only queries cannot break the FTS query."""
+        self.assertEqual(fts_query('idiot" OR NOT *'), '"idiot"* "OR"* "NOT"*')
+        self.assertEqual(self.search('"idiot'), [self.twice, self.once])
+        TextAnalysis.objects.create(text="!!!")
+        self.assertEqual(len(self.search("!!!")), 1)
+
+    def test_search_uses_the_index(self):
+        """The search reads the FTS index instead of scanning the table."""
+        queryset = TextAnalysis.objects.search("idiot")
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " | ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("VIRTUAL TABLE INDEX", plan)
+        self.assertNotIn("SCAN moderation_textanalysis ", plan + " ")
+
+    def test_home_search_parameter(self):
+        """The home page `search` parameter returns ranked matches."""
+        response = self.client.get(reverse('home'), {'search': 'idiot'})
+        self.assertEqual(list(response.context['analyses']), [self.twice, self.once])
+        self.assertEqual(response.context['total_count'], 2)
+
+    def test_dashboard_search_parameter(self):
+        """The dashboard `q` parameter searches the index and combines with the label filters."""
+        self.twice.insult = True
+        self.twice.save()
+        session = self.client.session
+        session['admin-token'] = 'token'
+        session.save()
+
+        response = self.client.get(reverse('dashboard'), {'q': 'idiot', 'insult': 'yes'})
+        self.assertEqual(list(response.context['data']), [self.twice])
@@ -0,0 +1,57 @@
+# Import necessary modules and classes
+import os
+import tempfile
+import unittest
+import pandas as pd
+from django.test import SimpleTestCase
+from transformers import BertTokenizerFast
+from config.config import MODEL_REPO_PATH, TEST_DATA_PATH
+from tests.fixtures import build_tiny_model
+
+try:
+    # transformers 5 keeps the pure-Python implementation under a separate name
+    from transformers import BertTokenizerLegacy as BertTokenizerSlow
+except ImportError:
+    from transformers import BertTokenizer as BertTokenizerSlow
+
+SAMPLE_TEXTS = [
+    "You are an IDIOT!!!",
+    "have a nice day, see you tomorrow :)",
+    "naïve café résumé — ünïcödé and emoji 😀",
+    "tabs\tand\nnewlines   and  spaces",
+    "https://example.com/some_page?x=1 user@example.com #hashtag",
+    "x" * 300,
+    "",
+]
+
+# Tests that the fast serving tokenizer encodes exactly like the slow reference tokenizer
+class TokenizerParityTest(SimpleTestCase):
+    def assert_same_ids(self, model_path, texts):
+        slow = BertTokenizerSlow.from_pretrained(model_path, local_files_only=True)
+        fast = BertTokenizerFast.from_pretrained(model_path, local_files_only=True)
+        self.assertTrue(fast.is_fast)
+
+        for max_length in (16, 512):
+            kwargs = {"truncation": True, "max_length": max_length}
+            self.assertEqual(slow(texts, **kwargs)["input_ids"], fast(texts, **kwargs)["input_ids"])
+
+        words = " ".join(texts).split()
+        self.assertEqual(
+            slow(words, is_split_into_words=True)["input_ids"],
+            fast(words, is_split_into_words=True)["input_ids"]
+        )
+
+    def test_tiny_vocab_parity(self):
+        """Fast and slow tokenizers agree on a vocabulary full of unknown words."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_tiny_model(tmpdir)
+            self.assert_same_ids(tmpdir, SAMPLE_TEXTS)
+
+    @unittest.skipUnless(os.path.exists(os.path.join(MODEL_REPO_PATH, "trained_model_v1.0.0", "vocab.txt")),
+                         "trained model not available")
+    def test_saved_vocab_parity(self):
+        """Fast and slow tokenizers agree on the saved vocab.txt for real comments."""
+        texts = list(SAMPLE_TEXTS)
+        if os.path.exists(TEST_DATA_PATH):
+            texts += pd.read_csv(TEST_DATA_PATH, nrows=200)["comment_text"].astype(str).tolist()
+        self.assert_same_ids(os.path.join(MODEL_REPO_PATH, "trained_model_v1.0.0"), texts)
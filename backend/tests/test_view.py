@@ -212,9 +212,12 @@ class ModHomeViewTest(TestCase):
 
     def test_home_page_pagination(self):
         """Test pagination functionality on the home page."""
-        response = self.client.get(reverse('home') + '?page=2')
+        first = self.client.get(reverse('home')).context['analyses']
+        response = self.client.get(reverse('home'), {'after': first.next_cursor})
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.context['analyses']), 10)
+        self.assertFalse(set(first) & set(response.context['analyses']))
+        self.assertEqual(response.context['total_count'], 25)
 
 # class AnalyzeTextViewTests(TestCase):
 #     @patch('app.views.BertTokenizerFast.from_pretrained')
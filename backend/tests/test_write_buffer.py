@@ -0,0 +1,96 @@
+# Import necessary modules and classes
+import time
+from unittest.mock import patch
+from django.db import DatabaseError
+from django.test import TransactionTestCase
+from django.urls import reverse
+from app.models import TextAnalysis
+from app.write_buffer import WriteBehindBuffer
+from tests.fixtures import TinyModelViewMixin
+
+
+def wait_for_rows(count, timeout=5):
+    """Poll until `count` analyses are stored, as the flusher writes from its own thread."""
+    deadline = time.monotonic() + timeout
+    while TextAnalysis.objects.count() < count and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return TextAnalysis.objects.count()
+
+
+# Tests for the write-behind buffer; the flusher thread needs committed tables, hence TransactionTestCase
+class WriteBehindBufferTests(TransactionTestCase):
+    def make_buffer(self, **kwargs):
+        buffer = WriteBehindBuffer(TextAnalysis, **{"batch_size": 100, "flush_interval": 60, **kwargs})
+        self.addCleanup(buffer.stop)
+        return buffer
+
+    def test_flushes_when_batch_is_full(self):
+        """A full batch is written without waiting for the interval."""
+        buffer = self.make_buffer(batch_size=3)
+        for index in range(3):
+            buffer.add(TextAnalysis(text=f"text {index}"))
+
+        self.assertEqual(wait_for_rows(3), 3)
+        self.assertEqual(buffer.stats()["flushes"], 1)
+
+    def test_flushes_after_interval(self):
+        """A partial batch is written once the flush interval has passed."""
+        buffer = self.make_buffer(flush_interval=0.05)
+        buffer.add(TextAnalysis(text="lonely"))
+        self.assertEqual(wait_for_rows(1), 1)
+
+    def test_stop_flushes_pending_rows(self):
+        """Shutting down writes everything still queued."""
+        buffer = self.make_buffer()
+        buffer.add(TextAnalysis(text="one"))
+        buffer.add(TextAnalysis(text="two"))
+        self.assertEqual(TextAnalysis.objects.count(), 0)
+
+        buffer.stop()
+        self.assertEqual(TextAnalysis.objects.count(), 2)
+        self.assertEqual(buffer.stats()["pending"], 0)
+
+    def test_failed_flush_is_retried(self):
+        """Rows are kept for the next flush when the database write fails."""
+        buffer = self.make_buffer()
+        buffer.add(TextAnalysis(text="retry me"))
+
+        with patch.object(TextAnalysis.objects, 'bulk_create', side_effect=DatabaseError("locked")):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(buffer.stats()["pending"], 1)
+
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(TextAnalysis.objects.get().text, "retry me")
+
+    def test_overflow_flushes_in_request(self):
+        """Beyond max_pending the adding caller writes the queue itself."""
+        buffer = self.make_buffer(max_pending=2)
+        for index in range(3):
+            buffer.add(TextAnalysis(text=f"text {index}"))
+        self.assertEqual(TextAnalysis.objects.count(), 3)
+
+
+# Tests for storing analyses from the analyze view through the buffer
+class AnalyzeTextWriteBehindTests(TinyModelViewMixin, TransactionTestCase):
+    def view_patches(self):
+        self.buffer = WriteBehindBuffer(TextAnalysis, batch_size=100, flush_interval=60)
+        return (patch('app.views.WRITE_BEHIND_ENABLED', True), patch('app.views.analysis_writes', self.buffer))
+
+    def tearDown(self):
+        self.buffer.stop()
+
+    def test_response_does_not_wait_for_the_write(self):
+        """The analysis is queued and stored by the next flush, so no id is returned yet."""
+        data = self.client.post(reverse('analyze_text'), {'text': 'you are an idiot'}).json()
+        self.assertTrue(data['success'])
+        self.assertIsNone(data['id'])
+        self.assertEqual(TextAnalysis.objects.count(), 0)
+
+        self.buffer.flush()
+        self.assertEqual(TextAnalysis.objects.get().text, 'you are an idiot')
+
+    def test_sync_mode_returns_the_id(self):
+        """With ?sync=1 the analysis is stored before the response."""
+        data = self.client.post(reverse('analyze_text') + '?sync=1', {'text': 'you are an idiot'}).json()
+        self.assertEqual(TextAnalysis.objects.get(id=data['id']).text, 'you are an idiot')
+        self.assertEqual(self.buffer.stats()["queued"], 0)